@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+
 LOW_YIELD_THRESHOLD = 0.40
 
 # ---------------------------------------------------
@@ -7,7 +9,7 @@ LOW_YIELD_THRESHOLD = 0.40
 def state_level_summary(df):
 
     summary = (
-        df.groupby("state")
+        df.groupby("state", observed=True)
         .agg(
             avg_agro_stress=("agro_stress_index", "mean"),
             avg_resilience=("resilience_score", "mean"),
@@ -29,7 +31,7 @@ def state_level_summary(df):
 def crop_resilience_ranking(df):
 
     ranking = (
-        df.groupby("crop")
+        df.groupby("crop", observed=True)
         .agg(
             avg_resilience=("resilience_score", "mean"),
             avg_stress=("agro_stress_index", "mean")
@@ -81,35 +83,80 @@ def stress_heatmap_matrix(df):
             values="agro_stress_index",
             index="state",
             columns="crop",
-            aggfunc="mean"
+            aggfunc="mean",
+            observed=True
         )
     )
 
     return pivot
 
-def compute_prediction_confidence(df):
+# ---------------------------------------------------
+# 6️ Low-Yield Labels + Prediction Confidence
+# ---------------------------------------------------
+def low_yield_labels(df):
+
+    # Actual low yield: more than one std below the system's mean yield
+    grouped = df.groupby(["state", "crop"], observed=True)["yield"]
 
-    df["predicted_low_yield"] = (
-        df["agro_stress_index"] > LOW_YIELD_THRESHOLD
+    return (
+        df["yield"] < grouped.transform("mean") - grouped.transform("std")
     ).astype(int)
 
-    mean_yield = df.groupby(["state", "crop"])["yield"].transform("mean")
-    std_yield = df.groupby(["state", "crop"])["yield"].transform("std")
 
-    df["actual_low_yield"] = (
-        df["yield"] < (mean_yield - std_yield)
-    ).astype(int)
+def add_prediction_labels(df, threshold=LOW_YIELD_THRESHOLD):
 
-    summary = df.groupby(["state", "crop"]).agg(
-        total_years=("yield", "count"),
-        predicted_lows=("predicted_low_yield", "sum"),
-        actual_lows=("actual_low_yield", "sum"),
-        correct_lows=(
-            "predicted_low_yield",
-            lambda x: ((x == 1) & 
-                       (df.loc[x.index, "actual_low_yield"] == 1)).sum()
-        )
-    ).reset_index()
+    return df.assign(
+        predicted_low_yield=(df["agro_stress_index"] > threshold).astype(int),
+        actual_low_yield=low_yield_labels(df)
+    )
+
+
+def compute_prediction_confidence(df, thresholds=None):
+
+    # One threshold keeps the original one-row-per-system shape;
+    # several return one row per (threshold, state, crop)
+    single = thresholds is None
+    thresholds = [LOW_YIELD_THRESHOLD] if single else list(thresholds)
+
+    grouped = df.groupby(["state", "crop"], observed=True)
+    codes = grouped.ngroup().to_numpy()
+    n_groups = grouped.ngroups
+
+    # Rows with a missing state or crop have no group (code -1, or NaN in
+    # newer pandas); groupby drops them, so they are left out here too
+    keep = codes >= 0
+    codes = codes[keep].astype(np.int64)
+
+    actual = low_yield_labels(df).to_numpy().astype(bool)[keep]
+    stress = df["agro_stress_index"].to_numpy()[keep]
+
+    base = grouped["yield"].count().rename("total_years").reset_index()
+    base["actual_lows"] = np.bincount(codes, weights=actual, minlength=n_groups).astype(int)
+
+    summaries = []
+
+    for threshold in thresholds:
+
+        predicted = stress > threshold
+
+        summary = base.copy()
+        summary["predicted_lows"] = np.bincount(
+            codes, weights=predicted, minlength=n_groups
+        ).astype(int)
+        summary["correct_lows"] = np.bincount(
+            codes, weights=predicted & actual, minlength=n_groups
+        ).astype(int)
+
+        if not single:
+            summary.insert(0, "threshold", threshold)
+
+        summaries.append(summary)
+
+    summary = pd.concat(summaries, ignore_index=True)
+    summary = summary[
+        [col for col in ["threshold", "state", "crop", "total_years", "predicted_lows",
+                         "actual_lows", "correct_lows"] if col in summary.columns]
+    ]
 
     # Recall-based confidence
     summary["confidence_score"] = (
@@ -120,5 +167,3 @@ def compute_prediction_confidence(df):
     summary.loc[summary["actual_lows"] < 3, "confidence_score"] *= 0.5
 
     return summary
-
-
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+from src.analysis.analysis import low_yield_labels
+
+
+# Global curves are cheap; per-system curves scale with systems x thresholds
+THRESHOLD_GRID = np.round(np.linspace(0, 1, 1001), 3)
+SYSTEM_THRESHOLD_GRID = np.round(np.linspace(0, 1, 101), 2)
+
+
+# ---------------------------------------------------
+# 1️ Counts for every (group, threshold) from one sort
+# ---------------------------------------------------
+def _sweep_counts(scores, labels, codes, n_groups, thresholds):
+
+    scores = np.asarray(scores, dtype=float)
+    labels = np.asarray(labels, dtype=bool)
+    thresholds = np.asarray(thresholds, dtype=float)
+
+    # Missing scores are never flagged (they sit below every threshold)
+    low, high = np.nanmin(scores), np.nanmax(scores)
+    scores = np.where(np.isnan(scores), low - 1, scores)
+
+    # Group g occupies keys [g*span, g*span + span), scores descending inside it
+    span = high - (low - 1) + 1
+    keys = codes * span + (high - scores)
+
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+
+    tp_cum = np.r_[0, np.cumsum(labels[order])]
+    starts = np.searchsorted(keys, np.arange(n_groups) * span, side="left")
+
+    # Predicted positive means score > t, i.e. key < g*span + (high - t)
+    cut = np.clip(thresholds, low - 0.5, high)
+    bounds = np.arange(n_groups)[:, None] * span + (high - cut)[None, :]
+    ends = np.searchsorted(keys, bounds.ravel(), side="left").reshape(bounds.shape)
+
+    predicted = ends - starts[:, None]
+    tp = tp_cum[ends] - tp_cum[starts][:, None]
+
+    positives = np.bincount(codes, weights=labels, minlength=n_groups).astype(int)
+    totals = np.bincount(codes, minlength=n_groups)
+
+    return predicted, tp, positives, totals
+
+
+def _curve_frame(thresholds, predicted, tp, positives, totals):
+
+    fp = predicted - tp
+    fn = positives - tp
+    negatives = totals - positives
+    tn = negatives - fp
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        precision = np.where(predicted > 0, tp / predicted, np.nan)
+        recall = np.where(positives > 0, tp / positives, np.nan)
+        fpr = np.where(negatives > 0, fp / negatives, np.nan)
+        f1 = 2 * precision * recall / (precision + recall)
+
+    return pd.DataFrame({
+        "threshold": thresholds,
+        "predicted": predicted,
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "tn": tn,
+        "precision": precision,
+        "recall": recall,
+        "fpr": fpr,
+        "f1": np.where(tp > 0, f1, 0.0)
+    })
+
+
+# ---------------------------------------------------
+# 2️ Global + Per-System Sweeps
+# ---------------------------------------------------
+def threshold_sweep(df, thresholds=THRESHOLD_GRID, score_col="agro_stress_index"):
+
+    labels = low_yield_labels(df).to_numpy()
+    codes = np.zeros(len(df), dtype=np.int64)
+
+    predicted, tp, positives, totals = _sweep_counts(
+        df[score_col].to_numpy(), labels, codes, 1, thresholds
+    )
+
+    return _curve_frame(thresholds, predicted[0], tp[0], positives[0], totals[0])
+
+
+def threshold_sweep_by_system(df, thresholds=SYSTEM_THRESHOLD_GRID, score_col="agro_stress_index"):
+
+    grouped = df.groupby(["state", "crop"], observed=True)
+    keys = grouped.size().index
+    codes = grouped.ngroup().to_numpy()
+
+    labels = low_yield_labels(df).to_numpy()
+
+    predicted, tp, positives, totals = _sweep_counts(
+        df[score_col].to_numpy(), labels, codes, grouped.ngroups, thresholds
+    )
+
+    n_thresholds = len(thresholds)
+
+    curve = _curve_frame(
+        np.tile(thresholds, grouped.ngroups),
+        predicted.ravel(),
+        tp.ravel(),
+        np.repeat(positives, n_thresholds),
+        np.repeat(totals, n_thresholds)
+    )
+
+    curve.insert(0, "crop", np.repeat(keys.get_level_values("crop"), n_thresholds))
+    curve.insert(0, "state", np.repeat(keys.get_level_values("state"), n_thresholds))
+
+    return curve
+
+
+# ---------------------------------------------------
+# 3️ Summaries
+# ---------------------------------------------------
+def roc_auc(df, score_col="agro_stress_index"):
+
+    # Exact AUC from ranks (Mann–Whitney U), ties counted as half
+    labels = low_yield_labels(df).to_numpy().astype(bool)
+    ranks = df[score_col].rank(method="average", na_option="top").to_numpy()
+
+    positives = labels.sum()
+    negatives = len(labels) - positives
+
+    if positives == 0 or negatives == 0:
+        return np.nan
+
+    return (ranks[labels].sum() - positives * (positives + 1) / 2) / (positives * negatives)
+
+
+def best_threshold(curve, metric="f1"):
+
+    # Highest metric; ties go to the lowest threshold
+    return curve.loc[curve[metric].idxmax()]
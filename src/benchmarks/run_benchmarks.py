@@ -0,0 +1,319 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from src.analysis.analysis import compute_prediction_confidence
+from src.benchmarks.synthetic import scale_layout, synthetic_tables
+from src.features.feature_engineering import run_feature_pipeline
+from src.graph.graph_snapshot import graph_version, load_graph_snapshot, write_graph_snapshot
+from src.graph.graph_store import build_graph_store
+from src.graph.knowledge_graph import build_graph
+from src.monitoring.timing import StageTimer
+from src.web.system_index import build_system_index
+
+
+SCALES = (1, 10, 100)
+
+RESULTS_DIR = "data/cache/benchmarks"
+
+# A stage is flagged when it gets this much slower than the baseline
+REGRESSION_RATIO = 1.2
+
+
+# ==========================================================
+# 1️⃣ Offline Pipeline
+# ==========================================================
+
+def bench_pipeline(df, rules_df, trace_memory=False):
+
+    timer = StageTimer(trace_memory=trace_memory)
+
+    # Every add_* step is timed inside the pipeline
+    features = run_feature_pipeline(df, rules_df, timer=timer)
+
+    with timer.stage("confidence", rows=len(features)):
+        confidence_df = compute_prediction_confidence(features)
+
+    enriched = features.merge(
+        confidence_df[["state", "crop", "confidence_score"]],
+        on=["state", "crop"],
+        how="left"
+    )
+
+    with timer.stage("build_graph", rows=len(enriched)):
+        build_graph(enriched)
+
+    with timer.stage("build_graph_store", rows=len(enriched)):
+        store = build_graph_store(enriched, rules_df, build_system_index(enriched))
+
+    # What the web app pays at startup: map the snapshot instead of rebuilding
+    version = graph_version("benchmark")
+    with tempfile.TemporaryDirectory() as graph_dir:
+
+        with timer.stage("write_graph_snapshot", nodes=len(store)):
+            write_graph_snapshot(store, version, graph_dir)
+
+        with timer.stage("load_graph_snapshot", nodes=len(store)):
+            load_graph_snapshot(version, graph_dir)
+
+    return enriched, timer.records
+
+
+# ==========================================================
+# 2️⃣ Question Interpretation + HTTP API
+# ==========================================================
+
+def _questions(index, n, seed=0):
+
+    rng = np.random.default_rng(seed)
+    systems = list(index.systems.values())
+
+    picks = rng.integers(0, len(systems), n)
+    questions = [
+        f"what is the {systems[i]['crop']} stress in {systems[i]['state']}?" for i in picks
+    ]
+
+    # Some traffic matches nothing and takes the fallback path
+    for i in range(0, n, 10):
+        questions[i] = "which system needs attention first?"
+
+    return questions
+
+
+def _latency_summary(latencies, seconds):
+
+    ms = np.asarray(latencies) * 1000
+
+    return {
+        "requests": len(ms),
+        "throughput_per_s": round(len(ms) / seconds, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3)
+    }
+
+
+def bench_resolve(snapshot, n=20000):
+
+    from src.web.app import resolve_question
+
+    questions = _questions(snapshot.index, n)
+
+    # The request path minus HTTP: resolve, then the (precomputed) answer
+    start = time.perf_counter()
+    for question in questions:
+        snapshot.answer(resolve_question(question, snapshot.index, snapshot.matcher), "farmer")
+    seconds = time.perf_counter() - start
+
+    return {"calls": n, "seconds": round(seconds, 6), "per_call_us": round(seconds / n * 1e6, 3)}
+
+
+async def _drive(client, make_request, n, concurrency):
+
+    latencies = []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with gate:
+            start = time.perf_counter()
+            response = await make_request(client, i)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+
+    return _latency_summary(latencies, time.perf_counter() - start)
+
+
+async def _bench_api(app, questions, n, concurrency):
+
+    transport = httpx.ASGITransport(app=app)
+
+    batch = [{"question": q} for q in questions[:50]]
+
+    endpoints = {
+        "POST /ask farmer": lambda c, i: c.post(
+            "/ask", data={"question": questions[i % len(questions)], "mode": "farmer"}
+        ),
+        "GET /ask research": lambda c, i: c.get(
+            "/ask", params={"question": questions[i % len(questions)], "mode": "research"}
+        ),
+        "POST / farmer": lambda c, i: c.post(
+            "/", data={"question": questions[i % len(questions)], "mode": "farmer"}
+        ),
+        "POST /api/v1/query x50": lambda c, i: c.post(
+            "/api/v1/query", json={"queries": batch}
+        ),
+        "GET /api/v1/graph page": lambda c, i: c.get(
+            "/api/v1/graph", params={"level": "system", "offset": (i % 10) * 50, "limit": 50}
+        ),
+        "GET analysis high-risk": lambda c, i: c.get(
+            "/api/v1/analysis/high-risk", params={"top_n": i % 50 + 1}
+        )
+    }
+
+    results = {}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, make_request in endpoints.items():
+            results[name] = await _drive(client, make_request, n, concurrency)
+
+    return results
+
+
+def bench_api(enriched, label, n=2000, concurrency=16):
+
+    # Imported late: the app module loads the real dataset at import time
+    from src.web.app import create_app
+    from src.web.snapshot import StaticSnapshotStore
+
+    # A separate app around the synthetic snapshot; the module-level app is untouched
+    store = StaticSnapshotStore(f"synthetic-{label}", enriched)
+    snapshot = store.current
+
+    results = {"resolve_question": bench_resolve(snapshot)}
+    results.update(asyncio.run(
+        _bench_api(create_app(store), _questions(snapshot.index, 1000, seed=1), n, concurrency)
+    ))
+
+    return results
+
+
+# ==========================================================
+# 3️⃣ Results + Regression Comparison
+# ==========================================================
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count()
+    }
+
+
+def run(scales=SCALES, api_requests=2000, concurrency=16, trace_memory=False):
+
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "scales": {}
+    }
+
+    for scale in scales:
+
+        districts, crop_copies = scale_layout(scale)
+        print(f"\n=== {scale}x ({districts} districts x {crop_copies} crop varieties) ===")
+
+        df, rules_df = synthetic_tables(scale)
+        enriched, pipeline = bench_pipeline(df, rules_df, trace_memory)
+
+        for record in pipeline:
+            print(f"{record['stage']:<22}{record['wall_s']:>10.3f}s")
+
+        api = bench_api(enriched, f"{scale}x", api_requests, concurrency)
+
+        for name, summary in api.items():
+            print(f"{name:<26}{json.dumps(summary)}")
+
+        results["scales"][str(scale)] = {
+            "rows": len(df),
+            "systems": int(enriched.groupby(["state", "crop"], observed=True).ngroups),
+            "pipeline": pipeline,
+            "api": api
+        }
+
+    return results
+
+
+def _flatten(results):
+
+    # One comparable number per (scale, measurement); lower is better
+    flat = {}
+
+    for scale, entry in results["scales"].items():
+
+        for record in entry["pipeline"]:
+            flat[f"{scale}x {record['stage']} wall_s"] = record["wall_s"]
+
+        for name, summary in entry["api"].items():
+            if "per_call_us" in summary:
+                flat[f"{scale}x {name} per_call_us"] = summary["per_call_us"]
+            else:
+                flat[f"{scale}x {name} p50_ms"] = summary["p50_ms"]
+
+    return flat
+
+
+def compare(results, baseline, ratio=REGRESSION_RATIO):
+
+    current = _flatten(results)
+    previous = _flatten(baseline)
+
+    regressions = []
+
+    print(f"\n{'measurement':<48}{'baseline':>12}{'current':>12}{'ratio':>8}")
+
+    for key, value in current.items():
+
+        if key not in previous or previous[key] <= 0:
+            continue
+
+        change = value / previous[key]
+        flag = "  REGRESSION" if change > ratio else ""
+        print(f"{key:<48}{previous[key]:>12.4f}{value:>12.4f}{change:>8.2f}{flag}")
+
+        if flag:
+            regressions.append(key)
+
+    return regressions
+
+
+def save_results(results, path=None):
+
+    if path is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"bench_{stamp}.json")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+    return path
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES), help="e.g. 10 100 1000")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per API endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--trace-memory", action="store_true", help="Record peak memory per step (slower)")
+    parser.add_argument("--out", help="Result path (default: data/cache/benchmarks/bench_<utc>.json)")
+    parser.add_argument("--compare", help="Baseline result JSON to compare against")
+    args = parser.parse_args()
+
+    results = run(args.scales, args.requests, args.concurrency, args.trace_memory)
+    print("\nResults:", save_results(results, args.out))
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f))
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
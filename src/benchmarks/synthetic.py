@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from src.storage.columnar import CLEANED_DIR, load_table
+from src.storage.schema import apply_schema
+
+
+# ==========================================================
+# Synthetic Scale-Up Datasets
+# ==========================================================
+# The real (state, crop, year) table is cloned into extra
+# "districts" and crop varieties, with noise on yield and
+# climate so group statistics differ between clones.
+
+def scale_layout(scale):
+
+    # Grow crops slower than districts (roughly cube root)
+    crop_copies = max(1, round(scale ** (1 / 3)))
+    districts = max(1, round(scale / crop_copies))
+
+    return districts, crop_copies
+
+
+def _suffixed(names, copy_ids, prefix):
+
+    # Copy 0 keeps the real name so the original systems stay queryable
+    names = names.astype(str).to_numpy(dtype=object)
+    suffix = np.where(copy_ids > 0, np.char.add(f" {prefix}", copy_ids.astype(str)), "")
+
+    return names + suffix.astype(object)
+
+
+def synthetic_tables(scale, seed=0, directory=CLEANED_DIR):
+
+    base = load_table("final_state_crop_with_climate", directory=directory)
+    rules = load_table("crop_disease_rules", directory=directory)
+
+    districts, crop_copies = scale_layout(scale)
+    copies = districts * crop_copies
+
+    rng = np.random.default_rng(seed)
+
+    n = len(base)
+    rows = np.tile(np.arange(n), copies)
+    district = np.repeat(np.arange(copies) // crop_copies, n)
+    variety = np.repeat(np.arange(copies) % crop_copies, n)
+
+    df = base.iloc[rows].reset_index(drop=True)
+    df["state"] = _suffixed(df["state"], district, "district ")
+    df["crop"] = _suffixed(df["crop"], variety, "variety ")
+
+    # Leave the first copy exact, perturb the clones
+    noisy = np.repeat(np.arange(copies) > 0, n)
+    size = len(df)
+
+    df["yield"] *= np.where(noisy, rng.lognormal(0, 0.1, size), 1)
+    df["rainfall_nasa"] *= np.where(noisy, rng.lognormal(0, 0.1, size), 1)
+    df["temperature_nasa"] += np.where(noisy, rng.normal(0, 0.5, size), 0)
+    df["humidity_nasa"] = (
+        df["humidity_nasa"] + np.where(noisy, rng.normal(0, 2, size), 0)
+    ).clip(0, 100)
+
+    rules_df = pd.concat([
+        rules.assign(crop=_suffixed(rules["crop"], np.full(len(rules), i), "variety "))
+        for i in range(crop_copies)
+    ], ignore_index=True)
+
+    return (
+        apply_schema(df, "final_state_crop_with_climate"),
+        apply_schema(rules_df, "crop_disease_rules")
+    )
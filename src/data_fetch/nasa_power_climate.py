@@ -1,8 +1,8 @@
-import os
-import time
-import requests
+import numpy as np
 import pandas as pd
-from tqdm import tqdm
+
+from src.data_fetch.power_client import PowerClient
+from src.storage.columnar import load_table, save_table
 
 
 # ==========================================================
@@ -36,68 +36,97 @@ STATE_COORDS = {
 # 2️⃣ NASA POWER API CALL (Monthly)
 # ==========================================================
 
-def fetch_climate_for_state(state, lat, lon, year_start, year_end):
-
-    url = (
-        "https://power.larc.nasa.gov/api/temporal/monthly/point?"
-        "parameters=T2M,PRECTOTCORR,RH2M"
-        "&community=RE"
-        f"&latitude={lat}"
-        f"&longitude={lon}"
-        f"&start={year_start}"
-        f"&end={year_end}"
-        "&format=json"
-    )
+# Days per month for a non-leap year (index 0 = January)
+DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# POWER parameter → dataset column
+POWER_COLUMNS = {
+    "T2M": "temperature_nasa",
+    "PRECTOTCORR": "rainfall_nasa",
+    "RH2M": "humidity_nasa"
+}
+
+
+def days_in_month(year, month):
+
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+
+    return DAYS_IN_MONTH[month - 1] + ((month == 2) & leap)
+
+
+def decode_power_parameters(pars):
+
+    keys = list(pars["T2M"].keys())
+
+    # YYYYMM keys as integers; non-numeric keys become -1 and are dropped
+    year_month = pd.to_numeric(pd.Index(keys), errors="coerce")
+    year_month = np.nan_to_num(np.asarray(year_month, dtype=float), nan=-1).astype(np.int64)
+
+    year = year_month // 100
+    month = year_month % 100
+
+    # Keep YYYYMM only (NASA includes month 13 for the annual summary)
+    keep = (year_month >= 100000) & (year_month <= 999999) & (month >= 1) & (month <= 12)
 
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+    columns = {"year": year[keep], "month": month[keep]}
 
-        if "properties" not in data:
-            print(f"⚠️ No data for {state}")
-            return pd.DataFrame()
+    for parameter, col in POWER_COLUMNS.items():
+        values = pars[parameter]
 
-        pars = data["properties"]["parameter"]
+        if list(values.keys()) == keys:
+            array = np.fromiter(values.values(), dtype=float, count=len(keys))
+        else:
+            array = np.array([values.get(k, np.nan) for k in keys], dtype=float)
 
-        records = []
+        columns[col] = array[keep]
 
-        for year_month in pars["T2M"].keys():
+    return columns
 
-         # Keep only YYYYMM (monthly data)
-            if len(str(year_month)) != 6:
-             continue
 
-            records.append({
-                "state": state,
-                "year_month": year_month,
-                "temperature_nasa": pars["T2M"].get(year_month),
-                "rainfall_nasa": pars["PRECTOTCORR"].get(year_month),
-                "humidity_nasa": pars["RH2M"].get(year_month)
-            })
+def payload_to_frame(state, payload):
 
-        return pd.DataFrame(records)
+    columns = decode_power_parameters(payload["properties"]["parameter"])
 
-    except Exception as e:
-        print(f"❌ Error fetching {state}: {e}")
-        return pd.DataFrame()
+    df = pd.DataFrame(columns)
+    df.insert(0, "state", state)
+
+    return df
+
+
+def fetch_climate_for_state(state, lat, lon, year_start, year_end, client=None):
+
+    client = client or PowerClient()
+    payload = client.fetch_point(lat, lon, year_start, year_end)
+
+    return payload_to_frame(state, payload)
 
 
 # ==========================================================
 # 3️⃣ BUILD FULL ANNUAL CLIMATE DATASET
 # ==========================================================
 
-def build_climate_dataset(year_start, year_end):
+def build_climate_dataset(year_start, year_end, client=None, allow_partial=False):
+
+    client = client or PowerClient()
 
-    all_data = []
+    # Concurrent, rate-limited fetch; cached points are not refetched
+    payloads, failures = client.fetch_points(STATE_COORDS, year_start, year_end)
 
-    for state, (lat, lon) in tqdm(STATE_COORDS.items()):
-        df = fetch_climate_for_state(state, lat, lon, year_start, year_end)
+    for state, error in sorted(failures.items()):
+        print(f"❌ Error fetching {state}: {error}")
 
-        if not df.empty:
-            all_data.append(df)
+    if failures and not allow_partial:
+        raise RuntimeError(
+            f"Climate fetch failed for {len(failures)} state(s): {sorted(failures)}. "
+            "Re-run to resume; fetched states are cached."
+        )
 
-        time.sleep(0.5)  # avoid API throttling
+    all_data = [
+        payload_to_frame(state, payloads[state])
+        for state in STATE_COORDS
+        if state in payloads
+    ]
+    all_data = [df for df in all_data if not df.empty]
 
     if not all_data:
         raise ValueError("No climate data fetched.")
@@ -108,44 +137,18 @@ def build_climate_dataset(year_start, year_end):
 
     climate_df = pd.concat(all_data, ignore_index=True)
 
-    # ----------------------------------------------------------
-    # Convert YYYYMM → Year + Month
-    # ----------------------------------------------------------
-
-# ----------------------------------------------------------
-# Extract year and month safely
-# ----------------------------------------------------------
-
-    climate_df["year_month"] = climate_df["year_month"].astype(str)
-
-   # Keep only YYYYMM format
-    climate_df = climate_df[
-      climate_df["year_month"].str.match(r"^\d{6}$")
-    ]
-
-   # Extract year and month
-    climate_df["year"] = climate_df["year_month"].str[:4].astype(int)
-    climate_df["month"] = climate_df["year_month"].str[4:].astype(int)
+    return aggregate_annual_climate(climate_df)
 
-   # Remove invalid months (NASA includes 13 for annual summary)
-    climate_df = climate_df[
-      (climate_df["month"] >= 1) &
-      (climate_df["month"] <= 12)
-   ]
 
-    climate_df.drop(columns=["year_month"], inplace=True)
+def aggregate_annual_climate(climate_df):
 
     # ----------------------------------------------------------
     # Convert rainfall (mm/day) → true monthly total
     # ----------------------------------------------------------
 
-    climate_df["days_in_month"] = pd.to_datetime(
-        climate_df["year"].astype(str) + "-" +
-        climate_df["month"].astype(str) + "-01"
-    ).dt.days_in_month
-
-    climate_df["rainfall_monthly_total"] = (
-        climate_df["rainfall_nasa"] * climate_df["days_in_month"]
+    rainfall_total = climate_df["rainfall_nasa"].to_numpy() * days_in_month(
+        climate_df["year"].to_numpy(),
+        climate_df["month"].to_numpy()
     )
 
     # ----------------------------------------------------------
@@ -154,20 +157,16 @@ def build_climate_dataset(year_start, year_end):
 
     annual_climate = (
         climate_df
+        .assign(rainfall_nasa=rainfall_total)
         .groupby(["state", "year"])
         .agg({
             "temperature_nasa": "mean",
-            "rainfall_monthly_total": "sum",
+            "rainfall_nasa": "sum",
             "humidity_nasa": "mean"
         })
         .reset_index()
     )
 
-    annual_climate.rename(
-        columns={"rainfall_monthly_total": "rainfall_nasa"},
-        inplace=True
-    )
-
     return annual_climate
 
 
@@ -175,18 +174,7 @@ def build_climate_dataset(year_start, year_end):
 # 4️⃣ MAIN EXECUTION
 # ==========================================================
 
-if __name__ == "__main__":
-
-    print("Loading cleaned crop dataset...")
-
-    crop_path = "data/cleaned/final_state_crop_dataset.csv"
-    df = pd.read_csv(crop_path)
-
-    raw_start = int(df["year"].min())
-    raw_end = int(df["year"].max())
-
-    year_start = max(raw_start, 1981)
-    year_end = raw_end
+def fetch_annual_climate(year_start, year_end):
 
     print(f"Fetching NASA POWER climate data from {year_start} to {year_end}...")
 
@@ -196,10 +184,22 @@ if __name__ == "__main__":
     print("\n=== Annual Climate Summary ===")
     print(annual_climate.describe())
 
-    os.makedirs("data/cleaned", exist_ok=True)
-
-    climate_path = "data/cleaned/nasa_power_annual_climate.csv"
-    annual_climate.to_csv(climate_path, index=False)
+    save_table(annual_climate, "nasa_power_annual_climate")
 
     print("\n✅ Annual climate data saved successfully.")
-    print(annual_climate.head())
\ No newline at end of file
+    print(annual_climate.head())
+
+
+if __name__ == "__main__":
+
+    print("Loading cleaned crop dataset...")
+
+    df = load_table("final_state_crop_dataset", columns=["year"])
+
+    raw_start = int(df["year"].min())
+    raw_end = int(df["year"].max())
+
+    year_start = max(raw_start, 1981)
+    year_end = raw_end
+
+    fetch_annual_climate(year_start, year_end)
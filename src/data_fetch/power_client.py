@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+
+
+POWER_MONTHLY_URL = "https://power.larc.nasa.gov/api/temporal/monthly/point"
+POWER_PARAMETERS = ("T2M", "PRECTOTCORR", "RH2M")
+POWER_COMMUNITY = "RE"
+
+CACHE_DIR = "data/cache/nasa_power"
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+# ==========================================================
+# 1️⃣ Token Bucket Rate Limiter
+# ==========================================================
+
+class TokenBucket:
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+# ==========================================================
+# 2️⃣ POWER Client (pooled session, retries, disk cache)
+# ==========================================================
+
+class PowerClient:
+
+    def __init__(
+        self,
+        base_url=POWER_MONTHLY_URL,
+        parameters=POWER_PARAMETERS,
+        cache_dir=CACHE_DIR,
+        max_workers=4,
+        rate=2.0,
+        burst=4,
+        max_retries=4,
+        backoff=1.0,
+        timeout=30
+    ):
+        self.base_url = base_url
+        self.parameters = tuple(parameters)
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self.bucket = TokenBucket(rate, burst)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    # ------------------------------------------------------
+    # Content-addressed cache
+    # ------------------------------------------------------
+    def cache_key(self, lat, lon, year_start, year_end):
+
+        request = {
+            "url": self.base_url,
+            "parameters": sorted(self.parameters),
+            "community": POWER_COMMUNITY,
+            "latitude": round(float(lat), 4),
+            "longitude": round(float(lon), 4),
+            "start": int(year_start),
+            "end": int(year_end)
+        }
+
+        return hashlib.sha256(
+            json.dumps(request, sort_keys=True).encode()
+        ).hexdigest()
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _read_cache(self, key):
+
+        path = self._cache_path(key)
+        if not os.path.exists(path):
+            return None
+
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_cache(self, key, payload):
+
+        path = self._cache_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------
+    # Single point
+    # ------------------------------------------------------
+    def fetch_point(self, lat, lon, year_start, year_end):
+
+        key = self.cache_key(lat, lon, year_start, year_end)
+
+        payload = self._read_cache(key)
+        if payload is not None:
+            return payload
+
+        params = {
+            "parameters": ",".join(self.parameters),
+            "community": POWER_COMMUNITY,
+            "latitude": lat,
+            "longitude": lon,
+            "start": year_start,
+            "end": year_end,
+            "format": "json"
+        }
+
+        for attempt in range(self.max_retries + 1):
+
+            self.bucket.acquire()
+
+            try:
+                response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                self._sleep_before_retry(attempt)
+                continue
+
+            if response.status_code in RETRY_STATUS and attempt < self.max_retries:
+                self._sleep_before_retry(attempt, response.headers.get("Retry-After"))
+                continue
+
+            response.raise_for_status()
+            payload = response.json()
+
+            if "properties" not in payload:
+                raise ValueError("POWER response has no 'properties' block.")
+
+            self._write_cache(key, payload)
+            return payload
+
+    def _sleep_before_retry(self, attempt, retry_after=None):
+
+        if retry_after is not None and retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            # Exponential backoff with jitter
+            delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+
+        time.sleep(delay)
+
+    # ------------------------------------------------------
+    # Many points (bounded worker pool)
+    # ------------------------------------------------------
+    def fetch_points(self, points, year_start, year_end):
+
+        results = {}
+        failures = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+
+            futures = {
+                pool.submit(self.fetch_point, lat, lon, year_start, year_end): name
+                for name, (lat, lon) in points.items()
+            }
+
+            for future in tqdm(as_completed(futures), total=len(futures)):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    failures[name] = str(e)
+
+        return results, failures
@@ -1,15 +1,12 @@
-import pandas as pd
+from src.storage.columnar import load_table, save_table
 
 
 def main():
 
     print("\nLoading datasets...")
 
-    crop_path = "data/cleaned/final_state_crop_dataset.csv"
-    climate_path = "data/cleaned/nasa_power_annual_climate.csv"
-
-    crop_df = pd.read_csv(crop_path)
-    climate_df = pd.read_csv(climate_path)
+    crop_df = load_table("final_state_crop_dataset")
+    climate_df = load_table("nasa_power_annual_climate")
 
     # ----------------------------------------------------------
     # Basic Validation
@@ -19,8 +16,8 @@ def main():
     print("Climate dataset shape:", climate_df.shape)
 
     # Ensure lowercase + strip (safety)
-    crop_df["state"] = crop_df["state"].str.lower().str.strip()
-    climate_df["state"] = climate_df["state"].str.lower().str.strip()
+    crop_df["state"] = crop_df["state"].astype(str).str.lower().str.strip()
+    climate_df["state"] = climate_df["state"].astype(str).str.lower().str.strip()
 
     # Ensure year is int
     crop_df["year"] = crop_df["year"].astype(int)
@@ -60,8 +57,7 @@ def main():
     # Save
     # ----------------------------------------------------------
 
-    output_path = "data/cleaned/final_state_crop_with_climate.csv"
-    merged.to_csv(output_path, index=False)
+    output_path = save_table(merged, "final_state_crop_with_climate")
 
     print("\nMerged dataset saved successfully.")
     print("Saved to:", output_path)
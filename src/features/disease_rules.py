@@ -0,0 +1,66 @@
+import numpy as np
+
+
+# Bound the rows x rules broadcast for very large crops
+CHUNK_ROWS = 65536
+
+TRIGGER_SEPARATOR = "; "
+
+
+# ---------------------------------------------------
+# Rule Evaluation Engine (per-crop broadcast)
+# ---------------------------------------------------
+def evaluate_disease_rules(df, rules_df):
+
+    n = len(df)
+
+    scores = np.zeros(n, dtype=int)
+    triggered = np.full(n, "", dtype=object)
+
+    temp = df["temperature_nasa"].to_numpy(dtype=float)
+    humidity = df["humidity_nasa"].to_numpy(dtype=float)
+    rainfall = df["rainfall_nasa"].to_numpy(dtype=float)
+
+    # Row positions per crop; each crop's rules only see that crop's rows
+    rows_by_crop = {
+        str(crop): rows
+        for crop, rows in df.groupby("crop", observed=True).indices.items()
+    }
+
+    for crop, rules in rules_df.groupby("crop", observed=True):
+
+        rows = rows_by_crop.get(str(crop))
+        if rows is None:
+            continue
+
+        temp_min = rules["temp_min"].to_numpy(dtype=float)
+        temp_max = rules["temp_max"].to_numpy(dtype=float)
+        humidity_min = rules["humidity_min"].to_numpy(dtype=float)
+        rainfall_min = rules["rainfall_min"].to_numpy(dtype=float)
+        diseases = rules["disease"].astype(str).to_numpy()
+
+        for start in range(0, len(rows), CHUNK_ROWS):
+
+            chunk = rows[start:start + CHUNK_ROWS]
+
+            t = temp[chunk, None]
+
+            # rows x rules trigger matrix
+            fired = (
+                (t >= temp_min) &
+                (t <= temp_max) &
+                (humidity[chunk, None] >= humidity_min) &
+                (rainfall[chunk, None] >= rainfall_min)
+            )
+
+            scores[chunk] = fired.sum(axis=1)
+
+            # Join disease names once per distinct firing pattern
+            patterns, inverse = np.unique(fired, axis=0, return_inverse=True)
+            labels = np.array(
+                [TRIGGER_SEPARATOR.join(diseases[p]) for p in patterns],
+                dtype=object
+            )
+            triggered[chunk] = labels[inverse.ravel()]
+
+    return scores, triggered
@@ -1,16 +1,26 @@
 import pandas as pd
 import numpy as np
 
+from src.features.disease_rules import evaluate_disease_rules
+from src.monitoring.timing import timed
+from src.features.group_kernels import (
+    group_normalize,
+    group_abs_normalize,
+    group_quantile,
+    group_rolling
+)
+
+# Rolling volatility window (years) and minimum observed years
+VOLATILITY_WINDOW = 5
+VOLATILITY_MIN_YEARS = 3
+
 
 # ---------------------------------------------------
 # Utility: Safe Group Normalization (0–1 scaling)
 # ---------------------------------------------------
 def _group_normalize(df, group_col, target_col, new_col_name):
 
-    df[new_col_name] = (
-        df.groupby(group_col)[target_col]
-        .transform(lambda x: x / x.max() if x.max() != 0 else 0)
-    )
+    df[new_col_name] = group_normalize(df, group_col, target_col)
 
     return df
 
@@ -20,12 +30,25 @@ def _group_normalize(df, group_col, target_col, new_col_name):
 # ---------------------------------------------------
 def add_nutrient_features(df):
 
+    df = compute_nutrient_stress(df)
+    df = normalize_nutrient_stress(df)
+
+    return df
+
+
+def compute_nutrient_stress(df):
+
     df["nutrient_stress"] = (
         abs(df["n_req_kg_per_ha"] - df["n"]) +
         abs(df["p_req_kg_per_ha"] - df["p"]) +
         abs(df["k_req_kg_per_ha"] - df["k"])
     )
 
+    return df
+
+
+def normalize_nutrient_stress(df):
+
     df = _group_normalize(
         df,
         "crop",
@@ -41,6 +64,15 @@ def add_nutrient_features(df):
 
 def add_climate_features(df):
 
+    df = compute_climate_signals(df)
+    df = compute_climate_stress(df)
+
+    return df
+
+
+# Per-(state, crop) signals: anomalies, extremes, raw volatility
+def compute_climate_signals(df):
+
     group_cols = ["state", "crop"]
 
     # ---------------------------------------------------
@@ -55,45 +87,50 @@ def add_climate_features(df):
     df["temp_anomaly"] = df["temperature_nasa"] - df["temp_mean"]
     df["rain_anomaly"] = df["rainfall_nasa"] - df["rain_mean"]
 
-    df["temp_anomaly_norm"] = (
-        df.groupby(group_cols)["temp_anomaly"]
-        .transform(lambda x: x / x.abs().max() if x.abs().max() != 0 else 0)
-    )
-
-    df["rain_anomaly_norm"] = (
-        df.groupby(group_cols)["rain_anomaly"]
-        .transform(lambda x: x / x.abs().max() if x.abs().max() != 0 else 0)
-    )
+    df["temp_anomaly_norm"] = group_abs_normalize(df, group_cols, "temp_anomaly")
+    df["rain_anomaly_norm"] = group_abs_normalize(df, group_cols, "rain_anomaly")
 
     # ---------------------------------------------------
     # 3️ Extreme Events (Top/Bottom 10%)
     # ---------------------------------------------------
-    temp_threshold = df.groupby(group_cols)["temperature_nasa"] \
-        .transform(lambda x: x.quantile(0.90))
+    temp_threshold = group_quantile(df, group_cols, "temperature_nasa", 0.90)
     df["heat_stress"] = (df["temperature_nasa"] >= temp_threshold).astype(int)
 
-    rain_threshold = df.groupby(group_cols)["rainfall_nasa"] \
-        .transform(lambda x: x.quantile(0.10))
+    rain_threshold = group_quantile(df, group_cols, "rainfall_nasa", 0.10)
     df["drought_stress"] = (df["rainfall_nasa"] <= rain_threshold).astype(int)
 
     # ---------------------------------------------------
     # 4️ Rolling 5-Year Volatility (Inter-Year Instability)
     # ---------------------------------------------------
-    df = df.sort_values(["state", "crop", "year"])
+    # Windows span calendar years, so missing years shrink the sample
+    volatility = f"std_{VOLATILITY_WINDOW}"
 
-    df["temp_volatility"] = (
-        df.groupby(group_cols)["temperature_nasa"]
-        .transform(lambda x: x.rolling(5, min_periods=3).std())
-    )
+    df["temp_volatility"] = group_rolling(
+        df, group_cols, "temperature_nasa",
+        windows=(VOLATILITY_WINDOW,), min_periods=VOLATILITY_MIN_YEARS
+    )[volatility]
 
-    df["rain_volatility"] = (
-        df.groupby(group_cols)["rainfall_nasa"]
-        .transform(lambda x: x.rolling(5, min_periods=3).std())
-    )
+    df["rain_volatility"] = group_rolling(
+        df, group_cols, "rainfall_nasa",
+        windows=(VOLATILITY_WINDOW,), min_periods=VOLATILITY_MIN_YEARS
+    )[volatility]
 
     df["temp_volatility"] = df["temp_volatility"].fillna(0)
     df["rain_volatility"] = df["rain_volatility"].fillna(0)
 
+    df.drop(columns=[
+        "temp_mean",
+        "rain_mean",
+        "temp_anomaly",
+        "rain_anomaly"
+    ], inplace=True)
+
+    return df
+
+
+# Crop-level volatility normalization + composite stress
+def compute_climate_stress(df):
+
     df = _group_normalize(df, "crop", "temp_volatility", "temp_volatility_norm")
     df = _group_normalize(df, "crop", "rain_volatility", "rain_volatility_norm")
 
@@ -115,10 +152,6 @@ def add_climate_features(df):
     # Clean Intermediate Columns
     # ---------------------------------------------------
     df.drop(columns=[
-        "temp_mean",
-        "rain_mean",
-        "temp_anomaly",
-        "rain_anomaly",
         "temp_volatility",
         "rain_volatility"
     ], inplace=True)
@@ -130,19 +163,23 @@ def add_climate_features(df):
 
 def add_disease_risk(df, rules_df):
 
-    df["disease_risk_score"] = 0
+    df = compute_disease_scores(df, rules_df)
+    df = normalize_disease_risk(df)
+
+    return df
+
+
+def compute_disease_scores(df, rules_df):
+
+    scores, triggered = evaluate_disease_rules(df, rules_df)
 
-    for _, rule in rules_df.iterrows():
+    df["disease_risk_score"] = scores
+    df["triggered_diseases"] = triggered
+
+    return df
 
-        mask = (
-            (df["crop"] == rule["crop"]) &
-            (df["temperature_nasa"] >= rule["temp_min"]) &
-            (df["temperature_nasa"] <= rule["temp_max"]) &
-            (df["humidity_nasa"] >= rule["humidity_min"]) &
-            (df["rainfall_nasa"] >= rule["rainfall_min"])
-        )
 
-        df.loc[mask, "disease_risk_score"] += 1
+def normalize_disease_risk(df):
 
     # Normalize per crop
     df = _group_normalize(df, "crop", "disease_risk_score", "disease_risk_norm")
@@ -153,6 +190,14 @@ def add_disease_risk(df, rules_df):
 # ---------------------------------------------------
 def add_yield_features(df):
 
+    df = compute_yield_statistics(df)
+    df = compute_yield_stability(df)
+
+    return df
+
+
+def compute_yield_statistics(df):
+
     group_cols = ["state", "crop"]
 
     df["mean_yield"] = df.groupby(group_cols)["yield"].transform("mean")
@@ -166,6 +211,11 @@ def add_yield_features(df):
     # Replace NaN volatility (if single year) with 0
     df["yield_volatility"] = df["yield_volatility"].fillna(0)
 
+    return df
+
+
+def compute_yield_stability(df):
+
     # Normalize volatility per crop
     df = _group_normalize(df, "crop", "yield_volatility", "yield_volatility_norm")
 
@@ -227,20 +277,96 @@ def add_priority_classification(df):
     return df
 
 # ---------------------------------------------------
-# MASTER PIPELINE
+# Pipeline Halves (used by incremental rebuilds)
 # ---------------------------------------------------
-def run_feature_pipeline(df, rules_df):
 
-    df = add_nutrient_features(df)
-    df = add_climate_features(df)
-    df = add_disease_risk(df, rules_df)
-    df = add_yield_features(df)
+# Columns that depend only on rows of the same (state, crop) group
+GROUP_FEATURE_COLUMNS = [
+    "nutrient_stress",
+    "temp_anomaly_norm",
+    "rain_anomaly_norm",
+    "heat_stress",
+    "drought_stress",
+    "temp_volatility",
+    "rain_volatility",
+    "disease_risk_score",
+    "triggered_diseases",
+    "mean_yield",
+    "yield_anomaly",
+    "yield_volatility"
+]
+
+# Output columns in the order run_feature_pipeline appends them
+FEATURE_COLUMNS = [
+    "nutrient_stress",
+    "nutrient_stress_norm",
+    "temp_anomaly_norm",
+    "rain_anomaly_norm",
+    "heat_stress",
+    "drought_stress",
+    "temp_volatility_norm",
+    "rain_volatility_norm",
+    "climate_stress",
+    "climate_stress_norm",
+    "disease_risk_score",
+    "triggered_diseases",
+    "disease_risk_norm",
+    "mean_yield",
+    "yield_anomaly",
+    "yield_volatility",
+    "yield_volatility_norm",
+    "stability_score",
+    "agro_stress_index",
+    "stress_interaction",
+    "resilience_score",
+    "intervention_priority",
+    "fragile_system"
+]
+
+
+def add_group_features(df, rules_df):
+
+    df = compute_nutrient_stress(df)
+    df = compute_climate_signals(df)
+    df = compute_disease_scores(df, rules_df)
+    df = compute_yield_statistics(df)
+
+    return df
+
+
+def add_crop_features(df):
+
+    df = normalize_nutrient_stress(df)
+    df = compute_climate_stress(df)
+    df = normalize_disease_risk(df)
+    df = compute_yield_stability(df)
     df = add_decision_support_features(df)
     df = add_priority_classification(df)
 
     return df
 
 
+# ---------------------------------------------------
+# MASTER PIPELINE
+# ---------------------------------------------------
+def run_feature_pipeline(df, rules_df, timer=None):
+
+    with timed(timer, "nutrient", rows=len(df)):
+        df = add_nutrient_features(df)
+    with timed(timer, "climate", rows=len(df)):
+        df = add_climate_features(df)
+    with timed(timer, "disease", rows=len(df)):
+        df = add_disease_risk(df, rules_df)
+    with timed(timer, "yield", rows=len(df)):
+        df = add_yield_features(df)
+    with timed(timer, "decision_support", rows=len(df)):
+        df = add_decision_support_features(df)
+    with timed(timer, "priority", rows=len(df)):
+        df = add_priority_classification(df)
+
+    return df
+
+
 
  
 
@@ -0,0 +1,134 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+# ---------------------------------------------------
+# Vectorized Group Kernels
+# ---------------------------------------------------
+# Built-in groupby reductions broadcast back to row shape,
+# so no Python callback runs per group.
+
+def group_max(df, group_cols, target_col):
+    return df.groupby(group_cols, observed=True)[target_col].transform("max")
+
+
+def group_abs_max(df, group_cols, target_col):
+    return df[target_col].abs().groupby(
+        [df[col] for col in np.atleast_1d(group_cols)], observed=True
+    ).transform("max")
+
+
+def group_quantile(df, group_cols, target_col, q):
+    return df.groupby(group_cols, observed=True)[target_col].transform("quantile", q)
+
+
+def safe_divide(values, scale):
+
+    # Groups whose scale is exactly zero map to 0 (NaN scales propagate)
+    return (values / scale).where(scale != 0, 0)
+
+
+# ---------------------------------------------------
+# Normalizations
+# ---------------------------------------------------
+def group_normalize(df, group_cols, target_col):
+    return safe_divide(df[target_col], group_max(df, group_cols, target_col))
+
+
+def group_abs_normalize(df, group_cols, target_col):
+    return safe_divide(df[target_col], group_abs_max(df, group_cols, target_col))
+
+
+# ---------------------------------------------------
+# Grouped Rolling Statistics (time-based windows)
+# ---------------------------------------------------
+# Each group is laid out on a dense (group x year) grid so that
+# missing years are explicit gaps, then window sums come from
+# per-group cumulative sums of x and x².
+
+ROLLING_STATS = ("mean", "std", "min", "max")
+
+
+def group_rolling(df, group_cols, target_col, time_col="year",
+                  windows=(5,), stats=("std",), min_periods=3):
+
+    columns = [f"{stat}_{window}" for window in windows for stat in stats]
+
+    if df.empty:
+        return pd.DataFrame(np.nan, index=df.index, columns=columns)
+
+    codes = df.groupby(group_cols, observed=True, sort=False).ngroup().to_numpy()
+    times = df[time_col].to_numpy().astype(np.int64)
+    values = df[target_col].to_numpy(dtype=float)
+
+    n_groups = codes.max() + 1
+
+    # Offset of each row inside its group's time span
+    start = np.full(n_groups, np.iinfo(np.int64).max)
+    np.minimum.at(start, codes, times)
+    offsets = times - start[codes]
+
+    grid = np.full((n_groups, offsets.max() + 1), np.nan)
+    grid[codes, offsets] = values
+
+    if np.count_nonzero(~np.isnan(grid)) != np.count_nonzero(~np.isnan(values)):
+        raise ValueError(f"Duplicate {time_col} values within a group.")
+
+    valid = ~np.isnan(grid)
+
+    # Centre on the group mean so x² sums stay well conditioned
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        group_mean = np.nanmean(grid, axis=1, keepdims=True)
+    centred = np.where(valid, grid - group_mean, 0.0)
+
+    pad = np.zeros((n_groups, 1))
+    cum_x = np.hstack([pad, np.cumsum(centred, axis=1)])
+    cum_x2 = np.hstack([pad, np.cumsum(centred ** 2, axis=1)])
+    cum_n = np.hstack([pad, np.cumsum(valid, axis=1)])
+
+    out = {}
+    end = offsets + 1
+
+    for window in windows:
+
+        begin = np.maximum(end - window, 0)
+
+        count = cum_n[codes, end] - cum_n[codes, begin]
+        total = cum_x[codes, end] - cum_x[codes, begin]
+        total2 = cum_x2[codes, end] - cum_x2[codes, begin]
+
+        enough = count >= min_periods
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+            var = (total2 - total * mean) / (count - 1)
+
+        for stat in stats:
+
+            if stat == "mean":
+                result = mean + group_mean[codes, 0]
+            elif stat == "std":
+                result = np.sqrt(np.maximum(var, 0))
+            elif stat in ("min", "max"):
+                result = _window_extreme(grid, codes, offsets, window, stat)
+            else:
+                raise ValueError(f"Unknown rolling stat '{stat}', expected one of {ROLLING_STATS}.")
+
+            out[f"{stat}_{window}"] = np.where(enough, result, np.nan)
+
+    return pd.DataFrame(out, index=df.index)[columns]
+
+
+def _window_extreme(grid, codes, offsets, window, stat):
+
+    # Left-pad so every row sees a full window of (possibly empty) years
+    padded = np.hstack([np.full((grid.shape[0], window - 1), np.nan), grid])
+    views = np.lib.stride_tricks.sliding_window_view(padded, window, axis=1)
+
+    rows = views[codes, offsets]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmin(rows, axis=1) if stat == "min" else np.nanmax(rows, axis=1)
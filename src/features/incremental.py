@@ -0,0 +1,194 @@
+import hashlib
+import inspect
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.features import disease_rules, feature_engineering, group_kernels
+from src.monitoring.timing import timed
+from src.features.feature_engineering import (
+    FEATURE_COLUMNS,
+    GROUP_FEATURE_COLUMNS,
+    add_crop_features,
+    add_group_features
+)
+
+
+FEATURE_CACHE_DIR = "data/cache/features"
+CACHE_FILE = "group_features.pkl"
+
+GROUP_COLS = ["state", "crop"]
+KEY_COLS = ["state", "crop", "year"]
+
+# Inputs read by the group-local feature steps
+GROUP_INPUT_COLUMNS = [
+    "year",
+    "yield",
+    "n_req_kg_per_ha",
+    "p_req_kg_per_ha",
+    "k_req_kg_per_ha",
+    "n",
+    "p",
+    "k",
+    "temperature_nasa",
+    "rainfall_nasa",
+    "humidity_nasa"
+]
+
+
+# ---------------------------------------------------
+# 1️. Fingerprints
+# ---------------------------------------------------
+def _code_version():
+
+    # Any edit to the feature code invalidates every cached group
+    sha = hashlib.sha256()
+    for module in (feature_engineering, group_kernels, disease_rules):
+        sha.update(inspect.getsource(module).encode())
+
+    return sha.hexdigest()
+
+
+def _row_keys(df):
+    return pd.MultiIndex.from_arrays([
+        df["state"].astype(str).to_numpy(),
+        df["crop"].astype(str).to_numpy()
+    ], names=GROUP_COLS)
+
+
+def _rules_hash_by_crop(rules_df):
+
+    hashes = {}
+    row_hash = pd.util.hash_pandas_object(
+        rules_df.astype(str), index=False
+    ).to_numpy()
+
+    for crop, rows in rules_df.groupby("crop", observed=True).indices.items():
+        hashes[str(crop)] = int(np.add.reduce(row_hash[rows], dtype=np.uint64))
+
+    return hashes
+
+
+def fingerprint_groups(df, rules_df):
+
+    # df must be sorted by (state, crop, year)
+    row_hash = pd.util.hash_pandas_object(
+        df[GROUP_INPUT_COLUMNS].astype(float), index=False
+    ).to_numpy()
+
+    keys = _row_keys(df)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+    # Order-independent sum (wraps mod 2**64); year is inside each row hash
+    sums = np.add.reduceat(row_hash, starts)
+    counts = np.diff(np.r_[starts, len(df)])
+
+    rules_hash = _rules_hash_by_crop(rules_df)
+
+    fingerprints = {}
+    for key, total, count in zip(keys[starts], sums, counts):
+        fingerprints[key] = (int(total), int(count), rules_hash.get(key[1], 0))
+
+    return fingerprints
+
+
+# ---------------------------------------------------
+# 2️. Cache
+# ---------------------------------------------------
+def _load_cache(cache_dir):
+
+    path = os.path.join(cache_dir, CACHE_FILE)
+    if not os.path.exists(path):
+        return None
+
+    cache = pd.read_pickle(path)
+    if cache.get("code_version") != _code_version():
+        return None
+
+    return cache
+
+
+def _save_cache(cache_dir, fingerprints, features):
+
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, CACHE_FILE)
+
+    # Write-then-rename so an interrupted run never leaves a torn cache
+    pd.to_pickle({
+        "code_version": _code_version(),
+        "fingerprints": fingerprints,
+        "features": features
+    }, path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+
+# ---------------------------------------------------
+# 3️. Incremental Pipeline
+# ---------------------------------------------------
+def run_incremental_feature_pipeline(df, rules_df, cache_dir=FEATURE_CACHE_DIR, timer=None):
+
+    if df.duplicated(KEY_COLS).any():
+        raise ValueError("Incremental features need unique (state, crop, year) rows.")
+
+    # Groups are processed in key order; the caller's row order and
+    # index are restored at the end, as run_feature_pipeline keeps them
+    input_index = df.index
+    df = df.reset_index(drop=True).sort_values(KEY_COLS)
+    input_cols = list(df.columns)
+
+    with timed(timer, "fingerprint", rows=len(df)):
+        fingerprints = fingerprint_groups(df, rules_df)
+
+    cache = _load_cache(cache_dir)
+    cached_fingerprints = cache["fingerprints"] if cache else {}
+
+    dirty = {
+        key for key, fp in fingerprints.items()
+        if cached_fingerprints.get(key) != fp
+    }
+
+    row_keys = _row_keys(df)
+    dirty_rows = row_keys.isin(list(dirty))
+
+    # Recompute group-local features for dirty groups only
+    with timed(timer, "group_features", rows=int(dirty_rows.sum()), groups=len(dirty)):
+        fresh = add_group_features(df[dirty_rows].copy(), rules_df)
+        fresh = fresh[KEY_COLS + GROUP_FEATURE_COLUMNS]
+
+    if cache:
+        reused = cache["features"]
+        reused = reused[~_row_keys(reused).isin(list(dirty))]
+        reused = reused[_row_keys(reused).isin(list(fingerprints))]
+        features = pd.concat([reused, fresh], ignore_index=True)
+    else:
+        features = fresh.reset_index(drop=True)
+
+    features["state"] = features["state"].astype(str)
+    features["crop"] = features["crop"].astype(str)
+    features["year"] = features["year"].astype(int)
+
+    aligned = features.set_index(KEY_COLS).reindex(
+        pd.MultiIndex.from_arrays([
+            df["state"].astype(str).to_numpy(),
+            df["crop"].astype(str).to_numpy(),
+            df["year"].astype(int).to_numpy()
+        ])
+    )
+
+    for col in GROUP_FEATURE_COLUMNS:
+        df[col] = aligned[col].to_numpy()
+
+    # Crop-level normalizations and global priority cut-offs are
+    # vectorized sweeps, so they are always recomputed in full
+    with timed(timer, "crop_features", rows=len(df)):
+        df = add_crop_features(df)
+
+    _save_cache(cache_dir, fingerprints, features)
+
+    output_cols = input_cols + [col for col in FEATURE_COLUMNS if col not in input_cols]
+
+    df = df[output_cols].sort_index()
+    df.index = input_index
+
+    return df, sorted(dirty)
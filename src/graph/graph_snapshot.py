@@ -0,0 +1,472 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+from collections import defaultdict
+from numbers import Integral, Real
+from types import MappingProxyType
+
+import numpy as np
+
+from src.graph.graph_store import build_graph_store
+from src.storage.columnar import CLEANED_DIR, load_table, table_version
+from src.web.system_index import build_system_index
+
+
+DATA_TABLE = "final_enriched_dataset"
+RULES_TABLE = "crop_disease_rules"
+
+GRAPH_DIR = "data/cache/graph"
+GRAPH_NAME = "agro_graph"
+
+# Bump when the binary layout or the node attributes change; old
+# snapshots are then rebuilt
+FORMAT_VERSION = 2
+
+# Arrays start on cache-line boundaries (as in shared_frame)
+ALIGNMENT = 64
+
+# (event node, year) packed into one sortable key; year 0 means "any year"
+EVENT_YEAR_SPAN = 10000
+
+
+# ==========================================================
+# 1️⃣ Versioning
+# ==========================================================
+# A snapshot is only valid for the exact dataset + rules it
+# was built from (content hashes, see table_version).
+
+def load_rules(directory=CLEANED_DIR):
+
+    # Disease nodes are optional: without rules the graph has none
+    try:
+        return load_table(RULES_TABLE, directory=directory)
+    except FileNotFoundError:
+        return None
+
+
+def graph_version(dataset_version, directory=CLEANED_DIR):
+
+    try:
+        rules_version = table_version(RULES_TABLE, directory)
+    except FileNotFoundError:
+        rules_version = None
+
+    return {"format": FORMAT_VERSION, "dataset": dataset_version, "rules": rules_version}
+
+
+def _layout_path(name, graph_dir):
+    return os.path.join(graph_dir, f"{name}.json")
+
+
+def _event_key(position, year):
+    return position * EVENT_YEAR_SPAN + (year or 0)
+
+
+# ==========================================================
+# 2️⃣ Write (CSR adjacency + typed attribute columns)
+# ==========================================================
+
+def _column_kind(name, values):
+
+    if all(isinstance(v, str) for v in values):
+        return "str"
+    if all(isinstance(v, Integral) and not isinstance(v, bool) for v in values):
+        return "int"
+    if all(isinstance(v, Real) and not isinstance(v, bool) for v in values):
+        return "float"
+
+    raise TypeError(f"Unsupported value types for node attribute '{name}'")
+
+
+def _encode_strings(values):
+
+    # Fixed-width bytes, sorted, so lookups are a searchsorted on the mapped array
+    encoded = np.array([str(v).encode() for v in values], dtype=bytes)
+
+    return encoded if len(encoded) else np.array([], dtype="S1")
+
+
+def _node_arrays(store, keys):
+
+    n = len(keys)
+    types = sorted({store.node(key)["type"] for key in keys})
+    type_codes = {kind: code for code, kind in enumerate(types)}
+
+    arrays = {
+        "keys": _encode_strings(keys),
+        "types": np.array([type_codes[store.node(key)["type"]] for key in keys], dtype=np.int8)
+    }
+
+    # attribute -> {node position: value}
+    columns = defaultdict(dict)
+    for position, key in enumerate(keys):
+        for attr, value in store.node(key).items():
+            if attr != "type":
+                columns[attr][position] = value
+
+    attributes = []
+
+    for attr, values in columns.items():
+
+        rows = np.fromiter(values.keys(), dtype=np.int64, count=len(values))
+        kind = _column_kind(attr, values.values())
+
+        present = np.zeros(n, dtype=bool)
+        present[rows] = True
+
+        if kind == "str":
+            categories, codes = np.unique(_encode_strings(values.values()), return_inverse=True)
+            column = np.full(n, -1, dtype=np.int32)
+            column[rows] = codes
+            arrays[f"{attr}.categories"] = categories
+        else:
+            column = np.zeros(n, dtype=np.int64 if kind == "int" else np.float64)
+            column[rows] = list(values.values())
+
+        arrays[f"{attr}.present"] = present
+        arrays[f"{attr}.values"] = column
+        attributes.append({"name": attr, "kind": kind})
+
+    return arrays, types, attributes
+
+
+def _edge_arrays(store, keys):
+
+    position = {key: i for i, key in enumerate(keys)}
+
+    relations = sorted({
+        relation for key in keys for relation in store.relations(key)
+    })
+    relation_codes = {relation: code for code, relation in enumerate(relations)}
+
+    # Per-node neighbour order is kept, so queries list nodes as the store does
+    indptr = np.zeros(len(keys) + 1, dtype=np.int64)
+    indices = []
+    codes = []
+
+    for i, key in enumerate(keys):
+        for relation, targets in store.relations(key).items():
+            indices.extend(position[target] for target in targets)
+            codes.extend([relation_codes[relation]] * len(targets))
+        indptr[i + 1] = len(indices)
+
+    events = sorted(
+        (_event_key(position[event], year), sorted(position[s] for s in systems))
+        for (event, year), systems in store.events()
+    )
+
+    event_indptr = np.zeros(len(events) + 1, dtype=np.int64)
+    event_indptr[1:] = np.cumsum([len(systems) for _, systems in events])
+
+    arrays = {
+        "indptr": indptr,
+        "indices": np.array(indices, dtype=np.int32),
+        "relations": np.array(codes, dtype=np.int8),
+        "event_keys": np.array([key for key, _ in events], dtype=np.int64),
+        "event_indptr": event_indptr,
+        "event_systems": np.array(
+            [s for _, systems in events for s in systems], dtype=np.int32
+        )
+    }
+
+    return arrays, relations
+
+
+def write_graph_snapshot(store, version, graph_dir=GRAPH_DIR, name=GRAPH_NAME):
+
+    keys = sorted(store.keys())
+
+    arrays, types, attributes = _node_arrays(store, keys)
+    edge_arrays, relations = _edge_arrays(store, keys)
+    arrays.update(edge_arrays)
+
+    entries = {}
+    offset = 0
+
+    for array_name, values in arrays.items():
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        entries[array_name] = {"dtype": values.dtype.str, "shape": list(values.shape), "offset": offset}
+        offset += values.nbytes
+
+    token = hashlib.sha256(
+        json.dumps(version, sort_keys=True).encode()
+    ).hexdigest()[:16]
+
+    os.makedirs(graph_dir, exist_ok=True)
+    data_file = f"{name}.{token}.bin"
+    data_path = os.path.join(graph_dir, data_file)
+
+    data = np.zeros(max(offset, 1), dtype=np.uint8)
+    for array_name, values in arrays.items():
+        start = entries[array_name]["offset"]
+        data[start:start + values.nbytes] = np.ascontiguousarray(values).view(np.uint8).ravel()
+
+    # Data first, layout last: a reader never sees a layout without its buffer
+    data.tofile(data_path + f".{os.getpid()}.tmp")
+    os.replace(data_path + f".{os.getpid()}.tmp", data_path)
+
+    layout = {
+        "version": version,
+        "nodes": len(keys),
+        "edges": int(arrays["indptr"][-1]),
+        "data_file": data_file,
+        "types": types,
+        "relations": relations,
+        "attributes": attributes,
+        "arrays": entries
+    }
+
+    layout_path = _layout_path(name, graph_dir)
+    with open(layout_path + f".{os.getpid()}.tmp", "w") as f:
+        json.dump(layout, f)
+    os.replace(layout_path + f".{os.getpid()}.tmp", layout_path)
+
+    # Older buffers stay valid for processes that already mapped them
+    for stale in glob.glob(os.path.join(graph_dir, f"{name}.*.bin")):
+        if os.path.basename(stale) != data_file:
+            os.remove(stale)
+
+    return layout_path
+
+
+def build_graph_snapshot(directory=CLEANED_DIR, graph_dir=GRAPH_DIR):
+
+    df = load_table(DATA_TABLE, directory=directory)
+    store = build_graph_store(df, load_rules(directory), build_system_index(df))
+
+    version = graph_version(table_version(DATA_TABLE, directory), directory)
+
+    return write_graph_snapshot(store, version, graph_dir)
+
+
+# ==========================================================
+# 3️⃣ Memory-Mapped Graph (same queries as GraphStore)
+# ==========================================================
+
+class GraphSnapshot:
+
+    def __init__(self, layout, arrays):
+
+        self.version = layout["version"]
+
+        self._keys = arrays["keys"]
+        self._types = arrays["types"]
+        self._type_names = layout["types"]
+        self._type_codes = {kind: code for code, kind in enumerate(layout["types"])}
+        self._relation_codes = {rel: code for code, rel in enumerate(layout["relations"])}
+
+        self._attributes = {
+            attr["name"]: (
+                attr["kind"],
+                arrays[f"{attr['name']}.present"],
+                arrays[f"{attr['name']}.values"],
+                arrays.get(f"{attr['name']}.categories")
+            )
+            for attr in layout["attributes"]
+        }
+
+        self._indptr = arrays["indptr"]
+        self._indices = arrays["indices"]
+        self._relations = arrays["relations"]
+
+        self._event_keys = arrays["event_keys"]
+        self._event_indptr = arrays["event_indptr"]
+        self._event_systems = arrays["event_systems"]
+
+    # ------------------------------------------------------
+    # Positions <-> keys / attribute values
+    # ------------------------------------------------------
+    @staticmethod
+    def _search(sorted_bytes, value):
+
+        encoded = str(value).encode()
+        if len(encoded) > sorted_bytes.dtype.itemsize:
+            return None
+
+        i = int(np.searchsorted(sorted_bytes, encoded))
+
+        return i if i < len(sorted_bytes) and sorted_bytes[i] == encoded else None
+
+    def _key(self, position):
+        return self._keys[position].decode()
+
+    def _node_at(self, position):
+
+        attrs = {"type": self._type_names[self._types[position]]}
+
+        for name, (kind, present, values, categories) in self._attributes.items():
+            if present[position]:
+                value = values[position]
+                if kind == "str":
+                    attrs[name] = categories[value].decode()
+                elif kind == "int":
+                    attrs[name] = int(value)
+                else:
+                    attrs[name] = float(value)
+
+        return MappingProxyType(attrs)
+
+    def _attribute_mask(self, name, value, rows):
+
+        if name not in self._attributes:
+            return np.zeros(len(rows), dtype=bool)
+
+        kind, present, values, categories = self._attributes[name]
+
+        if kind == "str":
+            code = self._search(categories, value)
+            if code is None:
+                return np.zeros(len(rows), dtype=bool)
+            return present[rows] & (values[rows] == code)
+
+        return present[rows] & (values[rows] == value)
+
+    def _neighbor_positions(self, position, relation=None, kind=None):
+
+        start, end = self._indptr[position], self._indptr[position + 1]
+        targets = self._indices[start:end]
+
+        if relation:
+            targets = targets[self._relations[start:end] == self._relation_codes.get(relation, -1)]
+
+        if kind is not None:
+            targets = targets[self._types[targets] == self._type_codes.get(kind, -1)]
+
+        return targets
+
+    # ------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------
+    def node(self, key):
+
+        position = self._search(self._keys, key)
+
+        return None if position is None else self._node_at(position)
+
+    def nodes(self, kind):
+
+        code = self._type_codes.get(kind)
+        if code is None:
+            return ()
+
+        return tuple(self._key(i) for i in np.flatnonzero(self._types == code))
+
+    def neighbors(self, key, relation=None, kind=None):
+
+        position = self._search(self._keys, key)
+        if position is None:
+            return ()
+
+        return tuple(self._key(i) for i in self._neighbor_positions(position, relation, kind))
+
+    def relations(self, key):
+
+        position = self._search(self._keys, key)
+        if position is None:
+            return {}
+
+        start, end = self._indptr[position], self._indptr[position + 1]
+        relations = {}
+
+        for relation, code in self._relation_codes.items():
+            targets = self._indices[start:end][self._relations[start:end] == code]
+            if len(targets):
+                relations[relation] = tuple(self._key(i) for i in targets)
+
+        return relations
+
+    def find(self, kind, **attrs):
+
+        rows = np.flatnonzero(self._types == self._type_codes.get(kind, -1))
+
+        for name, value in attrs.items():
+            rows = rows[self._attribute_mask(name, value, rows)]
+
+        return frozenset(self._key(i) for i in rows)
+
+    def event_systems(self, query):
+
+        event = self._search(self._keys, query.event)
+        if event is None:
+            return []
+
+        key = _event_key(event, query.year)
+        j = int(np.searchsorted(self._event_keys, key))
+        if j == len(self._event_keys) or self._event_keys[j] != key:
+            return []
+
+        systems = self._event_systems[self._event_indptr[j]:self._event_indptr[j + 1]]
+
+        if query.state is not None:
+            systems = systems[self._attribute_mask("state", query.state, systems)]
+        if query.crop is not None:
+            systems = systems[self._attribute_mask("crop", query.crop, systems)]
+
+        # Positions follow key order, so this is already sorted
+        return [self._key(i) for i in systems]
+
+    def event_observations(self, query, system):
+
+        event = self._search(self._keys, query.event)
+        position = self._search(self._keys, system)
+        if event is None or position is None:
+            return []
+
+        observations = self._neighbor_positions(position, "HAS_OBSERVATION")
+        if query.year is not None:
+            observations = observations[self._attribute_mask("year", query.year, observations)]
+
+        return [
+            self._node_at(obs) for obs in observations
+            if event in self._neighbor_positions(obs, "OCCURRED_IN")
+        ]
+
+    def __len__(self):
+        return len(self._keys)
+
+
+def load_graph_snapshot(version, graph_dir=GRAPH_DIR, name=GRAPH_NAME):
+
+    layout_path = _layout_path(name, graph_dir)
+    if not os.path.exists(layout_path):
+        return None
+
+    with open(layout_path) as f:
+        layout = json.load(f)
+
+    if layout["version"] != version:
+        return None
+
+    data_path = os.path.join(graph_dir, layout["data_file"])
+    if not os.path.exists(data_path):
+        return None
+
+    buffer = np.memmap(data_path, dtype=np.uint8, mode="r")
+
+    arrays = {}
+
+    for array_name, entry in layout["arrays"].items():
+
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"]))
+
+        # Zero-copy, read-only views into the shared page cache
+        if count:
+            values = np.frombuffer(buffer, dtype=dtype, count=count, offset=entry["offset"])
+        else:
+            values = np.empty(0, dtype=dtype)
+
+        arrays[array_name] = values.reshape(entry["shape"])
+
+    return GraphSnapshot(layout, arrays)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--graph-dir", default=GRAPH_DIR)
+    args = parser.parse_args()
+
+    print("Graph snapshot:", build_graph_snapshot(graph_dir=args.graph_dir))
@@ -0,0 +1,401 @@
+import re
+from collections import defaultdict, namedtuple
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from src.features.disease_rules import TRIGGER_SEPARATOR, evaluate_disease_rules
+
+
+# Binary climate flags that become climate-event nodes
+CLIMATE_EVENTS = {
+    "heat_stress": "heat stress",
+    "drought_stress": "drought stress"
+}
+
+OBSERVATION_METRICS = {
+    "agro_stress": "agro_stress_index",
+    "climate": "climate_stress_norm",
+    "disease": "disease_risk_norm",
+    "nutrient": "nutrient_stress_norm"
+}
+
+# Node attributes with an equality index
+INDEXED_ATTRIBUTES = ("state", "crop", "year", "priority")
+
+# "Which systems had <event> (in <year>) (in <state>) (for <crop>)?"
+EventQuery = namedtuple("EventQuery", ["event", "year", "state", "crop"])
+
+
+def node_id(kind, *parts):
+    return f"{kind}:" + "|".join(str(part) for part in parts)
+
+
+# ==========================================================
+# 1️⃣ Indexed Graph Store
+# ==========================================================
+
+def _adjacency(edges):
+
+    # edges: (sources, targets, relation) array blocks. Every edge is stored
+    # both ways; a node lists its relations and neighbours in edge order, once
+    relations = list(dict.fromkeys(relation for _, _, relation in edges))
+    n_relations = max(len(relations), 1)
+
+    sources = np.concatenate([np.concatenate([s, t]) for s, t, _ in edges] or [[]])
+    targets = np.concatenate([np.concatenate([t, s]) for s, t, _ in edges] or [[]])
+    relation_codes = np.repeat(
+        [relations.index(relation) for _, _, relation in edges],
+        [2 * len(s) for s, _, _ in edges]
+    ).astype(np.int64)
+
+    codes, keys = pd.factorize(np.concatenate([sources, targets]))
+    n = len(sources)
+    source_codes, target_codes = codes[:n].astype(np.int64), codes[n:].astype(np.int64)
+
+    # (node, relation) pairs, and duplicate (node, relation, target) entries dropped
+    pair = source_codes * n_relations + relation_codes
+    _, first = np.unique(pair * len(keys) + target_codes, return_index=True)
+    first.sort()
+
+    pair_codes, pairs = pd.factorize(pair[first])
+    order = np.argsort(pair_codes, kind="stable")
+    bounds = np.r_[0, np.cumsum(np.bincount(pair_codes, minlength=len(pairs)))].tolist()
+
+    keys = np.asarray(keys, dtype=object)
+    neighbours = keys[target_codes[first][order]].tolist()
+    pair_keys = keys[pairs // n_relations].tolist()
+    pair_relations = [relations[code] for code in (pairs % n_relations).tolist()]
+
+    adjacency = defaultdict(dict)
+    for p, (key, relation) in enumerate(zip(pair_keys, pair_relations)):
+        adjacency[key][relation] = tuple(neighbours[bounds[p]:bounds[p + 1]])
+
+    return dict(adjacency)
+
+
+def _event_index(occurrences):
+
+    # occurrences: (events, years, systems) array blocks -> (event, year) and
+    # (event, None) -> systems in which the event occurred
+    events = np.concatenate([e for e, _, _ in occurrences] or [[]]).astype(object)
+    years = np.concatenate([y for _, y, _ in occurrences] or [[]]).astype(np.int64)
+    systems = np.concatenate([s for _, _, s in occurrences] or [[]]).astype(object)
+
+    frame = pd.DataFrame({"event": pd.Series(events, dtype=object), "year": years})
+
+    index = {}
+    for (event, year), rows in frame.groupby(["event", "year"], sort=False).indices.items():
+        index[(event, int(year))] = frozenset(systems[rows].tolist())
+    for event, rows in frame.groupby("event", sort=False).indices.items():
+        index[(event, None)] = frozenset(systems[rows].tolist())
+
+    return index
+
+
+class GraphStore:
+
+    def __init__(self, nodes, edges, occurrences):
+
+        self._nodes = {key: MappingProxyType(attrs) for key, attrs in nodes.items()}
+
+        # node -> relation -> neighbours
+        self._adjacency = _adjacency(edges)
+
+        by_type = defaultdict(list)
+        by_attr = defaultdict(set)
+
+        for key, attrs in self._nodes.items():
+            by_type[attrs["type"]].append(key)
+            for attr in INDEXED_ATTRIBUTES:
+                if attr in attrs:
+                    by_attr[(attrs["type"], attr, attrs[attr])].add(key)
+
+        self._by_type = {kind: tuple(keys) for kind, keys in by_type.items()}
+        self._by_attr = {key: frozenset(values) for key, values in by_attr.items()}
+
+        # (event node, year or None) -> systems in which it occurred
+        self._event_index = _event_index(occurrences)
+
+    # ------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------
+    def node(self, key):
+        return self._nodes.get(key)
+
+    def nodes(self, kind):
+        return self._by_type.get(kind, ())
+
+    def neighbors(self, key, relation=None, kind=None):
+
+        relations = self._adjacency.get(key, {})
+        keys = relations.get(relation, ()) if relation else tuple(
+            target for targets in relations.values() for target in targets
+        )
+
+        if kind is None:
+            return keys
+
+        return tuple(target for target in keys if self._nodes[target]["type"] == kind)
+
+    def find(self, kind, **attrs):
+
+        if not attrs:
+            return frozenset(self.nodes(kind))
+
+        matches = [self._by_attr.get((kind, attr, value), frozenset()) for attr, value in attrs.items()]
+
+        return frozenset.intersection(*matches)
+
+    def event_systems(self, query):
+
+        systems = self._event_index.get((query.event, query.year), frozenset())
+
+        if query.state is not None:
+            systems = systems & self.find("system", state=query.state)
+        if query.crop is not None:
+            systems = systems & self.find("system", crop=query.crop)
+
+        return sorted(systems)
+
+    def event_observations(self, query, system):
+
+        # Observations of one system in which the event occurred
+        return [
+            self._nodes[obs] for obs in self.neighbors(system, "HAS_OBSERVATION")
+            if (query.year is None or self._nodes[obs]["year"] == query.year)
+            and query.event in self.neighbors(obs, "OCCURRED_IN")
+        ]
+
+    # ------------------------------------------------------
+    # Raw access (used by the binary snapshot writer)
+    # ------------------------------------------------------
+    def keys(self):
+        return self._nodes.keys()
+
+    def relations(self, key):
+        return self._adjacency.get(key, {})
+
+    def events(self):
+        return self._event_index.items()
+
+    def __len__(self):
+        return len(self._nodes)
+
+
+# ==========================================================
+# 2️⃣ Builder (bulk, from column arrays)
+# ==========================================================
+
+def group_mode(df, group_cols, target_col, default="Unknown"):
+
+    # Most frequent value per group; ties go to the smallest value,
+    # matching Series.mode()[0]. NaNs are ignored.
+    counts = (
+        df.groupby(group_cols + [target_col], observed=True)
+        .size()
+        .rename("count")
+        .reset_index()
+    )
+
+    top = (
+        counts.sort_values(["count", target_col], ascending=[False, True], kind="stable")
+        .drop_duplicates(group_cols)
+        .set_index(group_cols)[target_col]
+    )
+
+    keys = df.groupby(group_cols, observed=True).size().index
+
+    return top.astype(object).reindex(keys).fillna(default)
+
+
+def _system_extras(df):
+
+    # (state, crop) -> priority / resilience, as on the networkx system nodes
+    extras = defaultdict(dict)
+
+    if "intervention_priority" in df.columns:
+        priority = group_mode(df, ["state", "crop"], "intervention_priority")
+        for (state, crop), value in priority.items():
+            extras[(str(state), str(crop))]["priority"] = str(value)
+
+    if "resilience_score" in df.columns:
+        resilience = df.groupby(["state", "crop"], observed=True)["resilience_score"].mean()
+        for (state, crop), value in resilience.items():
+            extras[(str(state), str(crop))]["resilience"] = float(value)
+
+    return extras
+
+
+def _trigger_pairs(df, rules_df):
+
+    # (row position, disease) for every fired rule
+    if "triggered_diseases" in df.columns:
+        triggered = df["triggered_diseases"].astype(object).fillna("").to_numpy()
+    elif rules_df is not None:
+        triggered = evaluate_disease_rules(df, rules_df)[1]
+    else:
+        return np.array([], dtype=int), np.array([], dtype=object)
+
+    inverse, patterns = pd.factorize(triggered)
+    split = [[name for name in str(p).split(TRIGGER_SEPARATOR) if name] for p in patterns]
+
+    rows = []
+    names = []
+    for code, diseases in enumerate(split):
+        if diseases:
+            positions = np.flatnonzero(inverse == code)
+            for disease in diseases:
+                rows.append(positions)
+                names.append(np.full(len(positions), disease, dtype=object))
+
+    if not rows:
+        return np.array([], dtype=int), np.array([], dtype=object)
+
+    return np.concatenate(rows), np.concatenate(names)
+
+
+def build_graph_store(df, rules_df=None, index=None):
+
+    # index: optional SystemIndex whose summaries are merged into the system nodes
+    nodes = {}
+    edges = []          # (sources, targets, relation) array blocks
+    occurrences = []    # (events, years, systems) array blocks
+
+    states = df["state"].astype(str).to_numpy(dtype=object)
+    crops = df["crop"].astype(str).to_numpy(dtype=object)
+    years = df["year"].astype(int).to_numpy()
+
+    # Row-aligned ids, built with elementwise string ops (see node_id)
+    pairs = states + "|" + crops
+    year_text = years.astype(str).astype(object)
+
+    system_ids = "system:" + pairs
+    observation_ids = "obs:" + pairs + "|" + year_text
+    year_ids = "year:" + year_text
+
+    # ------------------------------------------------------
+    # State / crop / system / year nodes
+    # ------------------------------------------------------
+    for state in dict.fromkeys(states):
+        nodes[node_id("state", state)] = {"type": "state", "label": state, "state": state}
+
+    for crop in dict.fromkeys(crops):
+        nodes[node_id("crop", crop)] = {"type": "crop", "label": crop, "crop": crop}
+
+    for year in sorted(set(years.tolist())):
+        nodes[node_id("year", year)] = {"type": "year", "label": str(year), "year": year}
+
+    system_pairs = list(dict.fromkeys(zip(states, crops)))
+    extras = _system_extras(df)
+
+    for state, crop in system_pairs:
+
+        key = node_id("system", state, crop)
+        nodes[key] = {"type": "system", "label": f"{state} - {crop}", "state": state, "crop": crop}
+
+        if index is not None:
+            nodes[key].update(index.lookup(state, crop) or {})
+        nodes[key].update(extras.get((state, crop), {}))
+
+    system_keys = np.array([node_id("system", s, c) for s, c in system_pairs], dtype=object)
+    edges.append((
+        np.array([node_id("state", s) for s, _ in system_pairs], dtype=object), system_keys, "HAS_SYSTEM"
+    ))
+    edges.append((
+        np.array([node_id("crop", c) for _, c in system_pairs], dtype=object), system_keys, "SYSTEM_FOR"
+    ))
+
+    # ------------------------------------------------------
+    # Observation (system x year) nodes
+    # ------------------------------------------------------
+    columns = {
+        "label": (states + " - " + crops + " " + year_text).tolist(),
+        "state": states.tolist(),
+        "crop": crops.tolist(),
+        "year": years.tolist(),
+        "system": system_ids.tolist()
+    }
+    for name, col in OBSERVATION_METRICS.items():
+        if col in df.columns:
+            columns[name] = df[col].to_numpy(dtype=float).round(4).tolist()
+
+    names = ("type",) + tuple(columns)
+    nodes.update(zip(
+        observation_ids.tolist(),
+        (dict(zip(names, ("observation",) + values)) for values in zip(*columns.values()))
+    ))
+
+    edges.append((system_ids, observation_ids, "HAS_OBSERVATION"))
+    edges.append((observation_ids, year_ids, "IN_YEAR"))
+
+    # ------------------------------------------------------
+    # Climate events
+    # ------------------------------------------------------
+    for col, label in CLIMATE_EVENTS.items():
+
+        if col not in df.columns:
+            continue
+
+        event = node_id("event", col)
+        nodes[event] = {"type": "climate_event", "label": label, "name": col}
+
+        rows = np.flatnonzero(df[col].to_numpy() == 1)
+        events = np.full(len(rows), event, dtype=object)
+
+        edges.append((observation_ids[rows], events, "OCCURRED_IN"))
+        occurrences.append((events, years[rows], system_ids[rows]))
+
+    # ------------------------------------------------------
+    # Diseases (rules + triggered observations)
+    # ------------------------------------------------------
+    if rules_df is not None:
+
+        susceptible = [
+            (node_id("crop", crop), node_id("disease", disease))
+            for crop, disease in zip(rules_df["crop"].astype(str), rules_df["disease"].astype(str))
+        ]
+
+        for _, key in susceptible:
+            disease = key[len("disease:"):]
+            nodes.setdefault(key, {"type": "disease", "label": disease, "name": disease})
+
+        susceptible = [(crop, key) for crop, key in susceptible if crop in nodes]
+        edges.append((
+            np.array([crop for crop, _ in susceptible], dtype=object),
+            np.array([key for _, key in susceptible], dtype=object),
+            "SUSCEPTIBLE_TO"
+        ))
+
+    rows, diseases = _trigger_pairs(df, rules_df)
+
+    for disease in dict.fromkeys(diseases.tolist()):
+        nodes.setdefault(node_id("disease", disease), {"type": "disease", "label": disease, "name": disease})
+
+    disease_ids = "disease:" + diseases
+    edges.append((observation_ids[rows], disease_ids, "OCCURRED_IN"))
+    occurrences.append((disease_ids, years[rows], system_ids[rows]))
+
+    return GraphStore(nodes, edges, occurrences)
+
+
+# ==========================================================
+# 3️⃣ Question Parsing Helpers
+# ==========================================================
+
+YEAR_PATTERN = re.compile(r"\b(1[89]\d{2}|20\d{2})\b")
+
+# "Which systems / states / crops had ..." asks for a list, not one system
+LISTING_PATTERN = re.compile(r"\b(which|what)\s+(systems?|states|crops)\b", re.IGNORECASE)
+
+
+def find_year(question):
+
+    match = YEAR_PATTERN.search(question)
+
+    return int(match.group(1)) if match else None
+
+
+def asks_for_systems(question):
+    return LISTING_PATTERN.search(question) is not None
@@ -1,80 +1,100 @@
-import pandas as pd
 import networkx as nx
 from pyvis.network import Network
 
+from src.graph.graph_snapshot import build_graph_snapshot
+from src.graph.graph_store import group_mode
+from src.storage.columnar import load_table
 
-DATA_PATH = "data/cleaned/final_enriched_dataset.csv"
 
+DATA_TABLE = "final_enriched_dataset"
 
-def build_graph():
+GRAPH_COLUMNS = [
+    "state",
+    "crop",
+    "agro_stress_index",
+    "resilience_score",
+    "intervention_priority"
+]
 
-    df = pd.read_csv(DATA_PATH)
 
-    # Aggregate system-level data (state-crop)
+# ------------------------------------------------------
+# System-Level Aggregates (vectorized)
+# ------------------------------------------------------
+def system_summary(df):
+
     system_df = (
-        df.groupby(["state", "crop"])
-        .agg({
-            "agro_stress_index": "mean",
-            "resilience_score": "mean",
-            "intervention_priority": lambda x: x.mode()[0] if not x.mode().empty else "Unknown"
-        })
-        .reset_index()
+        df.groupby(["state", "crop"], observed=True)
+        .agg(
+            agro_stress_index=("agro_stress_index", "mean"),
+            resilience_score=("resilience_score", "mean")
+        )
     )
 
+    system_df["intervention_priority"] = group_mode(
+        df, ["state", "crop"], "intervention_priority"
+    )
+
+    return system_df.reset_index()
+
+
+def build_graph(df=None):
+
+    if df is None:
+        df = load_table(DATA_TABLE, columns=GRAPH_COLUMNS)
+
+    # Aggregate system-level data (state-crop)
+    system_df = system_summary(df)
+
+    states = system_df["state"].astype(str)
+    crops = system_df["crop"].astype(str)
+
+    state_ids = "state_" + states
+    crop_ids = "crop_" + crops
+    system_ids = "system_" + states + "_" + crops
+
     # Create graph
     G = nx.Graph()
 
     # ------------------------------------------------------
-    # Add State Nodes
+    # Add State + Crop Nodes
     # ------------------------------------------------------
-    states = system_df["state"].unique()
-    for state in states:
-        G.add_node(
-            f"state_{state}",
-            label=state,
-            type="state"
-        )
+    G.add_nodes_from(
+        (f"state_{state}", {"label": state, "type": "state"})
+        for state in states.unique()
+    )
 
-    # ------------------------------------------------------
-    # Add Crop Nodes
-    # ------------------------------------------------------
-    crops = system_df["crop"].unique()
-    for crop in crops:
-        G.add_node(
-            f"crop_{crop}",
-            label=crop,
-            type="crop"
-        )
+    G.add_nodes_from(
+        (f"crop_{crop}", {"label": crop, "type": "crop"})
+        for crop in crops.unique()
+    )
 
     # ------------------------------------------------------
-    # Add System Nodes + Edges
+    # Add System Nodes + Edges (bulk, from column arrays)
     # ------------------------------------------------------
-    for _, row in system_df.iterrows():
-
-        system_id = f"system_{row['state']}_{row['crop']}"
-
-        G.add_node(
-            system_id,
-            label=f"{row['state']} - {row['crop']}",
-            type="system",
-            stress=round(row["agro_stress_index"], 3),
-            resilience=round(row["resilience_score"], 3),
-            priority=row["intervention_priority"]
+    G.add_nodes_from(
+        (system_id, {
+            "label": f"{state} - {crop}",
+            "type": "system",
+            "stress": stress,
+            "resilience": resilience,
+            "priority": priority
+        })
+        for system_id, state, crop, stress, resilience, priority in zip(
+            system_ids,
+            states,
+            crops,
+            # float64 first: rounding float32 leaves 0.44999998... in the attributes
+            system_df["agro_stress_index"].astype("float64").round(3).tolist(),
+            system_df["resilience_score"].astype("float64").round(3).tolist(),
+            system_df["intervention_priority"].tolist()
         )
+    )
 
-        # Connect to state
-        G.add_edge(
-            f"state_{row['state']}",
-            system_id,
-            relationship="HAS_SYSTEM"
-        )
+    # Connect to state
+    G.add_edges_from(zip(state_ids, system_ids), relationship="HAS_SYSTEM")
 
-        # Connect to crop
-        G.add_edge(
-            f"crop_{row['crop']}",
-            system_id,
-            relationship="SYSTEM_FOR"
-        )
+    # Connect to crop
+    G.add_edges_from(zip(crop_ids, system_ids), relationship="SYSTEM_FOR")
 
     return G
 
@@ -150,6 +170,8 @@ def main():
 
     print("Graph saved as agro_knowledge_graph.html")
 
+    print("Graph snapshot saved as", build_graph_snapshot())
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,165 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Request latencies span sub-millisecond lookups to multi-second batches
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames, values, extra=None):
+
+    pairs = list(zip(labelnames, values))
+    if extra is not None:
+        pairs.append(extra)
+
+    if not pairs:
+        return ""
+
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+# ==========================================================
+# 1️⃣ Metric Types (in-process, thread-safe)
+# ==========================================================
+
+class Counter:
+
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+
+        with self._lock:
+            values = dict(self._values)
+
+        for key, value in sorted(values.items()):
+            yield self.name + _format_labels(self.labelnames, key), value
+
+
+class Histogram:
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        slot = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts (last slot is +Inf) and running sum
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][slot] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+
+        for key, (counts, total) in sorted(series.items()):
+
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield (
+                    self.name + "_bucket" + _format_labels(self.labelnames, key, ("le", le)),
+                    cumulative
+                )
+
+            yield self.name + "_sum" + _format_labels(self.labelnames, key), total
+            yield self.name + "_count" + _format_labels(self.labelnames, key), cumulative
+
+
+class CallbackMetric:
+
+    # Value read at scrape time (cache sizes, counters kept elsewhere)
+    def __init__(self, name, help, kind, labelnames, callback):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def samples(self):
+        for key, value in sorted(self.callback().items()):
+            yield self.name + _format_labels(self.labelnames, key), value
+
+
+# ==========================================================
+# 2️⃣ Registry + Text Exposition
+# ==========================================================
+
+class Registry:
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered.")
+
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def callback(self, name, help, kind, labelnames, callback):
+        return self.register(CallbackMetric(name, help, kind, labelnames, callback))
+
+    def render(self):
+
+        lines = []
+
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample, value in metric.samples():
+                lines.append(f"{sample} {value}")
+
+        return "\n".join(lines) + "\n"
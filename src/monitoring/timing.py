@@ -0,0 +1,86 @@
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+METRICS_DIR = "data/cache/metrics"
+
+
+# ==========================================================
+# Per-Stage Wall / CPU / Memory Timings
+# ==========================================================
+
+class StageTimer:
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.records = []
+
+    @contextmanager
+    def stage(self, name, **info):
+
+        # Peak is process wide: stages running concurrently share it
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+
+        # Process CPU, so work a stage hands to worker threads is counted;
+        # stages running concurrently each see the other's CPU too
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        status = "ok"
+
+        try:
+            yield
+        except Exception:
+            status = "failed"
+            raise
+        finally:
+            record = {
+                "stage": name,
+                "status": status,
+                "wall_s": round(time.perf_counter() - wall, 6),
+                "cpu_s": round(time.process_time() - cpu, 6)
+            }
+
+            if self.trace_memory:
+                record["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 3)
+            if tracing:
+                tracemalloc.stop()
+
+            record.update(info)
+            self.records.append(record)
+
+    def report(self):
+        return {
+            "total_wall_s": round(sum(r["wall_s"] for r in self.records), 6),
+            "stages": list(self.records)
+        }
+
+    def write_report(self, name, directory=METRICS_DIR):
+
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}.json")
+
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.report(), f, indent=2)
+        os.replace(path + ".tmp", path)
+
+        return path
+
+    def print_report(self):
+
+        print(f"\n{'stage':<22}{'wall s':>10}{'cpu s':>10}{'peak MB':>10}")
+        for r in self.records:
+            peak = f"{r['peak_mb']:>10.1f}" if "peak_mb" in r else f"{'-':>10}"
+            print(f"{r['stage']:<22}{r['wall_s']:>10.3f}{r['cpu_s']:>10.3f}{peak}")
+
+
+def timed(timer, name, **info):
+
+    # Optional instrumentation: no timer, no overhead
+    return timer.stage(name, **info) if timer is not None else nullcontext()
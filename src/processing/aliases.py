@@ -0,0 +1,16 @@
+# ==========================================================
+# Name aliases → canonical dataset names
+# ==========================================================
+
+# Historical / alternate state spellings
+STATE_ALIASES = {
+    "orissa": "odisha"
+}
+
+# Common regional crop names
+CROP_ALIASES = {
+    "paddy": "rice",
+    "corn": "maize",
+    "chana": "chickpea",
+    "bengal gram": "chickpea"
+}
@@ -0,0 +1,325 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src.processing import clean
+from src.data_fetch.nasa_power_climate import fetch_annual_climate
+from src.data_processing.merge_climate import main as merge_climate
+from src.runner.run_pipeline import build_enriched_dataset
+from src.graph import graph_snapshot, knowledge_graph
+from src.storage.columnar import save_table
+from src.monitoring.timing import StageTimer
+
+
+MANIFEST_PATH = "data/cache/pipeline_manifest.json"
+
+CLEANED = "data/cleaned"
+
+# Code every stage depends on
+COMMON_CODE = ["src/storage/columnar.py", "src/storage/schema.py"]
+
+
+# ==========================================================
+# 1️⃣ Stage Declarations
+# ==========================================================
+
+class Stage:
+
+    def __init__(self, name, func, inputs, outputs, code):
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+        self.outputs = outputs
+        self.code = code + COMMON_CODE
+
+
+def _write_disease_rules():
+    save_table(clean.build_disease_rules(), "crop_disease_rules")
+
+
+def _clean_state_dataset():
+    save_table(clean.merge_soil(clean.build_state_backbone()), "final_state_crop_dataset")
+
+
+def _fetch_climate():
+    # Year range comes from the raw history, so the fetch does not wait on clean
+    fetch_annual_climate(*clean.historical_year_range())
+
+
+def _build_graph():
+    knowledge_graph.visualize_graph(knowledge_graph.build_graph())
+    graph_snapshot.build_graph_snapshot()
+
+
+def build_stages(incremental=False):
+
+    return [
+        Stage(
+            "disease_rules",
+            _write_disease_rules,
+            inputs=[],
+            outputs=[f"{CLEANED}/crop_disease_rules.csv"],
+            code=["src/processing/clean.py"]
+        ),
+        Stage(
+            "clean",
+            _clean_state_dataset,
+            inputs=[clean.HIST_PATH, clean.SOIL_PATH],
+            outputs=[f"{CLEANED}/final_state_crop_dataset.csv"],
+            code=["src/processing/clean.py", "src/processing/aliases.py"]
+        ),
+        Stage(
+            "climate",
+            _fetch_climate,
+            inputs=[clean.HIST_PATH],
+            outputs=[f"{CLEANED}/nasa_power_annual_climate.csv"],
+            code=[
+                "src/data_fetch/nasa_power_climate.py",
+                "src/data_fetch/power_client.py"
+            ]
+        ),
+        Stage(
+            "merge",
+            merge_climate,
+            inputs=[
+                f"{CLEANED}/final_state_crop_dataset.csv",
+                f"{CLEANED}/nasa_power_annual_climate.csv"
+            ],
+            outputs=[f"{CLEANED}/final_state_crop_with_climate.csv"],
+            code=["src/data_processing/merge_climate.py"]
+        ),
+        Stage(
+            "features",
+            lambda: build_enriched_dataset(incremental=incremental),
+            inputs=[
+                f"{CLEANED}/final_state_crop_with_climate.csv",
+                f"{CLEANED}/crop_disease_rules.csv"
+            ],
+            outputs=[f"{CLEANED}/final_enriched_dataset.csv"],
+            code=[
+                "src/runner/run_pipeline.py",
+                "src/storage/columnar.py",
+                "src/storage/shared_frame.py",
+                "src/features/feature_engineering.py",
+                "src/features/group_kernels.py",
+                "src/features/disease_rules.py",
+                "src/features/incremental.py",
+                "src/analysis/analysis.py"
+            ]
+        ),
+        Stage(
+            "graph",
+            _build_graph,
+            inputs=[
+                f"{CLEANED}/final_enriched_dataset.csv",
+                f"{CLEANED}/crop_disease_rules.csv"
+            ],
+            outputs=[
+                "static/agro_knowledge_graph.html",
+                f"{graph_snapshot.GRAPH_DIR}/{graph_snapshot.GRAPH_NAME}.json"
+            ],
+            code=[
+                "src/graph/knowledge_graph.py",
+                "src/graph/graph_store.py",
+                "src/graph/graph_snapshot.py",
+                "src/web/system_index.py"
+            ]
+        ),
+    ]
+
+
+# ==========================================================
+# 2️⃣ Content Hashing + Manifest
+# ==========================================================
+
+def file_hash(path):
+
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+
+    return sha.hexdigest()
+
+
+def code_hash(stage):
+
+    sha = hashlib.sha256(stage.name.encode())
+    for path in stage.code:
+        sha.update(path.encode())
+        sha.update(file_hash(path).encode())
+
+    return sha.hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+# ==========================================================
+# 3️⃣ Stage Execution
+# ==========================================================
+
+def _outputs_match(stage, record):
+
+    for path in stage.outputs:
+        if not os.path.exists(path):
+            return False
+        if record["outputs"].get(path) != file_hash(path):
+            return False
+
+    return True
+
+
+def _run_stage(stage, manifest, lock, force, dry_run, upstream_changed, timer):
+
+    missing = [path for path in stage.inputs if not os.path.exists(path)]
+
+    if missing:
+        # Raw sources are optional once their outputs exist (see README)
+        if all(os.path.exists(path) for path in stage.outputs):
+            return "unavailable"
+        raise FileNotFoundError(f"{stage.name}: missing inputs {missing}")
+
+    fingerprint = {
+        "inputs": {path: file_hash(path) for path in stage.inputs},
+        "code": code_hash(stage)
+    }
+
+    with lock:
+        record = manifest.get(stage.name)
+
+    up_to_date = (
+        record is not None and
+        record["fingerprint"] == fingerprint and
+        _outputs_match(stage, record)
+    )
+
+    if dry_run:
+        return "stale" if force or upstream_changed or not up_to_date else "cached"
+
+    if up_to_date and not force:
+        return "cached"
+
+    with timer.stage(stage.name):
+        stage.func()
+
+    with lock:
+        manifest[stage.name] = {
+            "fingerprint": fingerprint,
+            "outputs": {path: file_hash(path) for path in stage.outputs}
+        }
+
+    return "ran"
+
+
+def run_stages(stages, force=False, dry_run=False, max_workers=2):
+
+    producers = {path: stage.name for stage in stages for path in stage.outputs}
+    deps = {
+        stage.name: {producers[path] for path in stage.inputs if path in producers}
+        for stage in stages
+    }
+
+    manifest = load_manifest()
+    lock = threading.Lock()
+
+    # Memory tracing is process wide, so only wall / CPU time per stage here
+    timer = StageTimer(trace_memory=False)
+
+    status = {}
+    pending = {stage.name: stage for stage in stages}
+    running = {}
+
+    # Independent stages (e.g. clean vs. climate fetch) run concurrently
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+
+        while pending or running:
+
+            for name in list(pending):
+
+                dep_status = [status.get(dep) for dep in deps[name]]
+
+                if any(s in ("failed", "blocked") for s in dep_status):
+                    status[name] = "blocked"
+                    del pending[name]
+
+                elif all(s is not None for s in dep_status):
+                    upstream_changed = any(s in ("ran", "stale") for s in dep_status)
+                    future = pool.submit(
+                        _run_stage, pending.pop(name), manifest, lock,
+                        force, dry_run, upstream_changed, timer
+                    )
+                    running[future] = name
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = running.pop(future)
+                try:
+                    status[name] = future.result()
+                except Exception as e:
+                    print(f"❌ Stage {name} failed: {e}")
+                    status[name] = "failed"
+
+    if not dry_run:
+        save_manifest(manifest)
+
+    if timer.records:
+        timer.print_report()
+        timer.write_report("pipeline_dag")
+
+    return status
+
+
+# ==========================================================
+# 4️⃣ MAIN EXECUTION
+# ==========================================================
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--force", action="store_true", help="Rerun every stage")
+    parser.add_argument("--dry-run", action="store_true", help="Only report which stages are stale")
+    parser.add_argument("--incremental", action="store_true", help="Incremental feature stage")
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    stages = build_stages(incremental=args.incremental)
+    status = run_stages(
+        stages,
+        force=args.force,
+        dry_run=args.dry_run,
+        max_workers=args.workers
+    )
+
+    print("\n=== PIPELINE STATUS ===")
+    for stage in stages:
+        print(f"{stage.name:<15} {status.get(stage.name, 'skipped')}")
+
+    if any(s in ("failed", "blocked") for s in status.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,12 @@
-import pandas as pd
-from src.analysis.analysis import compute_prediction_confidence
+from src.storage.columnar import load_table
+from src.storage.schema import TABLE_SCHEMAS
+from src.analysis.analysis import LOW_YIELD_THRESHOLD, compute_prediction_confidence
+from src.analysis.threshold_sweep import (
+    best_threshold,
+    roc_auc,
+    threshold_sweep,
+    threshold_sweep_by_system
+)
 from src.analysis.analysis import (
     state_level_summary,
     crop_resilience_ranking,
@@ -8,30 +15,20 @@ from src.analysis.analysis import (
     stress_heatmap_matrix
 )
 
-REQUIRED_COLUMNS = [
-    "temperature_nasa",
-    "rainfall_nasa",
-    "humidity_nasa",
-    "nutrient_stress_norm",
-    "climate_stress_norm",
-    "disease_risk_norm"
-]
+DATA_TABLE = "final_enriched_dataset"
 
 
 def main():
 
-    df = pd.read_csv("data/cleaned/final_enriched_dataset.csv")
+    # Schema-typed load; raises if required columns are missing
+    df = load_table(DATA_TABLE)
 
     # ----------------------------------------------------------
     # Sanity Checks
     # ----------------------------------------------------------
 
-    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
-    if missing:
-        raise ValueError(f"Missing required columns: {missing}")
-
     print("\nNull Check:")
-    print(df[REQUIRED_COLUMNS].isnull().sum())
+    print(df[TABLE_SCHEMAS[DATA_TABLE].required].isnull().sum())
 
     # ----------------------------------------------------------
     # Analysis Outputs
@@ -57,49 +54,44 @@ def main():
     print(confidence_df.sort_values("confidence_score", ascending=False).head())
 
     print("\n=== Crop Stress Variability (STD) ===")
-    print(df.groupby("crop")[[
+    print(df.groupby("crop", observed=True)[[
         "nutrient_stress_norm",
         "climate_stress_norm",
         "disease_risk_norm"
     ]].std())
     print(
-    df.groupby(["state","crop"])[
+    df.groupby(["state","crop"], observed=True)[
         ["predicted_low_yield","actual_low_yield"]
     ].sum())
     
 
-    print("\n=== THRESHOLD SWEEP (RECALL) ===")
-    for t in [0.40, 0.45, 0.50, 0.55, 0.60, 0.65]:
-        print(f"{t} → Recall: {evaluate_threshold(df, t):.3f}")
-    
-
-    
-# ---------------------------------------------------
-# Threshold Evaluation (Recall-Based)
-# ---------------------------------------------------
-
-def evaluate_threshold(df, threshold):
-
-    temp = df.copy()
-
-    temp["predicted"] = (
-        temp["agro_stress_index"] > threshold
-    ).astype(int)
+    # ----------------------------------------------------------
+    # Threshold Calibration (one sort, full grid)
+    # ----------------------------------------------------------
 
-    mean_yield = temp.groupby(["state","crop"])["yield"].transform("mean")
-    std_yield = temp.groupby(["state","crop"])["yield"].transform("std")
+    curve = threshold_sweep(df)
 
-    temp["actual"] = (
-        temp["yield"] < (mean_yield - std_yield)
-    ).astype(int)
+    print("\n=== THRESHOLD SWEEP (RECALL) ===")
+    shown = curve[curve["threshold"].isin([0.40, 0.45, 0.50, 0.55, 0.60, 0.65])]
+    for t, value in zip(shown["threshold"], shown["recall"]):
+        print(f"{t} → Recall: {value:.3f}")
 
-    recall = (
-        ((temp["predicted"] == 1) &
-         (temp["actual"] == 1)).sum()
-        / temp["actual"].sum()
+    best = best_threshold(curve)
+    print(f"\nROC AUC: {roc_auc(df):.3f}")
+    print(
+        f"Best F1 threshold: {best['threshold']:.3f} "
+        f"(F1 {best['f1']:.3f}, precision {best['precision']:.3f}, recall {best['recall']:.3f}) "
+        f"vs LOW_YIELD_THRESHOLD {LOW_YIELD_THRESHOLD}"
     )
 
-    return recall
+    print("\n=== BEST F1 THRESHOLD PER SYSTEM ===")
+    by_system = threshold_sweep_by_system(df)
+    best_by_system = by_system.loc[
+        by_system.groupby(["state", "crop"], observed=True)["f1"].idxmax(),
+        ["state", "crop", "threshold", "f1", "precision", "recall"]
+    ]
+    print(best_by_system.sort_values("f1", ascending=False).head(10))
+
 
 
 if __name__ == "__main__":
@@ -1,34 +1,67 @@
-import pandas as pd
+import argparse
+
+from src.storage.columnar import load_table
+from src.storage.shared_frame import save_shared_table
 from src.features.feature_engineering import run_feature_pipeline
-from src.analysis.analysis import compute_prediction_confidence
-from src.dashboard.farmer_dashboard import generate_farmer_dashboard
-from src.dashboard.researcher_dashboard import generate_researcher_dashboard
+from src.features.incremental import run_incremental_feature_pipeline
+from src.analysis.analysis import add_prediction_labels, compute_prediction_confidence
+from src.monitoring.timing import StageTimer, timed
 
 
-def main():
+def build_enriched_dataset(incremental=False, timer=None, trace_memory=False):
 
-    df = pd.read_csv("data/cleaned/final_state_crop_with_climate.csv")
-    rules_df = pd.read_csv("data/cleaned/crop_disease_rules.csv")
+    # tracemalloc slows every step down, so peak memory is opt-in
+    timer = timer if timer is not None else StageTimer(trace_memory=trace_memory)
 
-    df = run_feature_pipeline(df, rules_df)
+    with timed(timer, "load"):
+        df = load_table("final_state_crop_with_climate")
+        rules_df = load_table("crop_disease_rules")
 
-    # Merge confidence score
-    confidence_df = compute_prediction_confidence(df)
+    if incremental:
+        df, recomputed = run_incremental_feature_pipeline(df, rules_df, timer=timer)
+        print("Recomputed groups:", len(recomputed))
+    else:
+        df = run_feature_pipeline(df, rules_df, timer=timer)
 
-    df = df.merge(
-        confidence_df[["state", "crop", "confidence_score"]],
-        on=["state", "crop"],
-        how="left"
-    )
+    # Low-yield labels + confidence score
+    with timed(timer, "confidence", rows=len(df)):
+        confidence_df = compute_prediction_confidence(df)
 
-    df.to_csv("data/cleaned/final_enriched_dataset.csv", index=False)
+        df = add_prediction_labels(df)
+        df = df.merge(
+            confidence_df[["state", "crop", "confidence_score"]],
+            on=["state", "crop"],
+            how="left"
+        )
+
+    with timed(timer, "save", rows=len(df)):
+        # Also rebuilds the layout serving workers attach to
+        save_shared_table(df, "final_enriched_dataset")
 
     print("Feature engineering complete.")
     print("Rows:", len(df))
     print("Columns:", len(df.columns))
 
-    generate_farmer_dashboard()
-    generate_researcher_dashboard()
+    timer.print_report()
+    print("Timings:", timer.write_report("feature_pipeline"))
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse cached features for (state, crop) groups whose inputs are unchanged"
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Record peak memory per step (slower, and inflates the timings)"
+    )
+    args = parser.parse_args()
+
+    build_enriched_dataset(incremental=args.incremental, trace_memory=args.trace_memory)
 
 
 if __name__ == "__main__":
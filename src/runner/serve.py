@@ -0,0 +1,62 @@
+import argparse
+import os
+
+import uvicorn
+
+from src.graph.graph_snapshot import build_graph_snapshot, graph_version, load_graph_snapshot
+from src.storage.columnar import table_version
+from src.storage.shared_frame import attach_table, materialize_table
+
+
+DATA_TABLE = "final_enriched_dataset"
+
+
+# ==========================================================
+# 1️⃣ Pre-Fork Preparation (parent process only)
+# ==========================================================
+# Workers only attach to what is built here; none of them writes
+# the shared layout or the graph snapshot, so they never race.
+
+def prepare(name=DATA_TABLE):
+
+    if attach_table(name) is None:
+        print("Materialized:", materialize_table(name))
+    else:
+        print("Shared layout is current:", name)
+
+    if load_graph_snapshot(graph_version(table_version(name))) is None:
+        print("Graph snapshot:", build_graph_snapshot())
+    else:
+        print("Graph snapshot is current")
+
+
+# ==========================================================
+# 2️⃣ Serve
+# ==========================================================
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--prepare-only",
+        action="store_true",
+        help="Build the shared layout and graph snapshot, then exit (for external process managers)"
+    )
+    args = parser.parse_args()
+
+    prepare()
+
+    if args.prepare_only:
+        return
+
+    # Inherited by the worker processes uvicorn starts
+    os.environ["AGRO_SHARED_DATASET"] = "1"
+
+    uvicorn.run("src.web.app:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+from src.storage.schema import TABLE_SCHEMAS, apply_schema, csv_dtypes, validate_columns
+
+
+CLEANED_DIR = "data/cleaned"
+
+# Fallback typing for tables without a declared schema
+CATEGORICAL_COLUMNS = ["state", "crop", "intervention_priority"]
+
+
+# ==========================================================
+# 1️⃣ Typed Columnar Layout
+# ==========================================================
+
+def compact_dtypes(df):
+
+    df = df.copy()
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    # Annual tables only: monthly tables keep YYYYMM in "year"
+    if "year" in df.columns and df["year"].between(
+        np.iinfo(np.int16).min, np.iinfo(np.int16).max
+    ).all():
+        df["year"] = df["year"].astype(np.int16)
+
+    float_cols = df.select_dtypes(include="float64").columns
+    df[float_cols] = df[float_cols].astype(np.float32)
+
+    return df
+
+
+# ==========================================================
+# 2️⃣ Paths
+# ==========================================================
+
+def table_paths(name, directory=CLEANED_DIR):
+    return (
+        os.path.join(directory, f"{name}.parquet"),
+        os.path.join(directory, f"{name}.csv")
+    )
+
+
+def _columnar_is_current(parquet_path, csv_path):
+
+    if not HAS_PYARROW or not os.path.exists(parquet_path):
+        return False
+
+    # A hand-edited / freshly pulled CSV wins over a stale binary copy
+    if os.path.exists(csv_path):
+        return os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+
+    return True
+
+
+def table_source(name, directory=CLEANED_DIR):
+
+    # The file load_table would read right now
+    parquet_path, csv_path = table_paths(name, directory)
+    return parquet_path if _columnar_is_current(parquet_path, csv_path) else csv_path
+
+
+def marker_path(name, directory=CLEANED_DIR):
+    return os.path.join(directory, f"{name}.version")
+
+
+def _read_marker(name, directory):
+
+    path = marker_path(name, directory)
+    if not os.path.exists(path):
+        return None
+
+    with open(path) as f:
+        return f.read().strip()
+
+
+def table_marker(name, directory=CLEANED_DIR):
+
+    # What watchers poll: the version save_table writes after both files,
+    # or the source file's stat for tables written some other way
+    marker = _read_marker(name, directory)
+
+    return marker if marker is not None else table_stamp(name, directory)
+
+
+def table_stamp(name, directory=CLEANED_DIR):
+
+    # Cheap change detector (a stat call, no read)
+    path = table_source(name, directory)
+    stat = os.stat(path)
+
+    return {"path": path, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def typed_frame(df, name):
+    # The dtypes save_table stores, whichever file df was read from
+    return apply_schema(df, name) if name in TABLE_SCHEMAS else compact_dtypes(df)
+
+
+def frame_version(df, name):
+
+    # Content hash of the typed rows: the same data has one version
+    # whether it comes from the CSV export or the Parquet table
+    typed = typed_frame(df, name)
+
+    sha = hashlib.sha256(",".join(map(str, typed.columns)).encode())
+    sha.update(pd.util.hash_pandas_object(typed, index=False).to_numpy().tobytes())
+
+    return sha.hexdigest()[:12]
+
+
+def table_version(name, directory=CLEANED_DIR):
+
+    # The version save_table recorded, so every worker agrees on it.
+    # Tables without a marker are hashed from their rows (a full read)
+    marker = _read_marker(name, directory)
+    if marker is not None:
+        return marker
+
+    return frame_version(load_table(name, directory=directory), name)
+
+
+# ==========================================================
+# 3️⃣ Save / Load
+# ==========================================================
+
+def write_table_marker(name, version, directory=CLEANED_DIR):
+
+    path = marker_path(name, directory)
+    with open(path + ".tmp", "w") as f:
+        f.write(version)
+    os.replace(path + ".tmp", path)
+
+    return path
+
+
+def save_table(df, name, directory=CLEANED_DIR, export_csv=True, mark=True):
+
+    os.makedirs(directory, exist_ok=True)
+    parquet_path, csv_path = table_paths(name, directory)
+
+    # Each file is written aside and renamed in, so readers never see half a file.
+    # CSV first so the columnar copy is never older than its export
+    if export_csv or not HAS_PYARROW:
+        df.to_csv(csv_path + ".tmp", index=False)
+        os.replace(csv_path + ".tmp", csv_path)
+
+    typed = typed_frame(df, name)
+
+    if HAS_PYARROW:
+        typed.to_parquet(parquet_path + ".tmp", index=False)
+        os.replace(parquet_path + ".tmp", parquet_path)
+
+    # Version marker last: one change per save for watchers (see table_marker).
+    # mark=False leaves it to the caller, to build derived copies first
+    if mark:
+        write_table_marker(name, frame_version(typed, name), directory)
+
+    return parquet_path if HAS_PYARROW else csv_path
+
+
+def load_table(name, columns=None, directory=CLEANED_DIR):
+
+    parquet_path, csv_path = table_paths(name, directory)
+
+    if _columnar_is_current(parquet_path, csv_path):
+        df = pd.read_parquet(parquet_path, columns=columns)
+    else:
+        df = pd.read_csv(csv_path, usecols=columns, dtype=csv_dtypes(name))
+        if columns is not None:
+            df = df[columns]
+
+    validate_columns(df, name, columns)
+
+    return apply_schema(df, name)
+
+
+def convert_csv_tables(directory=CLEANED_DIR):
+
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow is required to write columnar tables.")
+
+    converted = []
+
+    for file in sorted(os.listdir(directory)):
+        if file.endswith(".csv"):
+            name = file[:-len(".csv")]
+            df = pd.read_csv(os.path.join(directory, file))
+            # Also writes the version marker, so no converted table goes without one
+            save_table(df, name, directory, export_csv=False)
+            converted.append(name)
+
+    return converted
+
+
+if __name__ == "__main__":
+
+    for name in convert_csv_tables():
+        print("Converted:", name)
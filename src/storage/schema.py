@@ -0,0 +1,177 @@
+import numpy as np
+
+
+# ==========================================================
+# 1️⃣ Column Groups
+# ==========================================================
+
+KEY_COLUMNS = {
+    "state": "category",
+    "crop": "category",
+    "year": "int16"
+}
+
+YIELD_COLUMNS = {
+    "yield": "float32",
+    "n_req_kg_per_ha": "float32",
+    "p_req_kg_per_ha": "float32",
+    "k_req_kg_per_ha": "float32",
+    "n": "float32",
+    "p": "float32",
+    "k": "float32",
+    "ph": "float32"
+}
+
+# Historical station climate (kept for reference, superseded by NASA)
+LEGACY_CLIMATE_COLUMNS = {
+    "rainfall": "float32",
+    "temperature": "float32",
+    "humidity": "float32"
+}
+
+CLIMATE_COLUMNS = {
+    "temperature_nasa": "float32",
+    "rainfall_nasa": "float32",
+    "humidity_nasa": "float32"
+}
+
+FEATURE_COLUMNS = {
+    "nutrient_stress": "float32",
+    "nutrient_stress_norm": "float32",
+    "temp_anomaly_norm": "float32",
+    "rain_anomaly_norm": "float32",
+    "heat_stress": "int8",
+    "drought_stress": "int8",
+    "temp_volatility_norm": "float32",
+    "rain_volatility_norm": "float32",
+    "climate_stress": "float32",
+    "climate_stress_norm": "float32",
+    "disease_risk_score": "int16",
+    "triggered_diseases": "category",
+    "disease_risk_norm": "float32",
+    "mean_yield": "float32",
+    "yield_anomaly": "float32",
+    "yield_volatility": "float32",
+    "yield_volatility_norm": "float32",
+    "stability_score": "float32",
+    "agro_stress_index": "float32",
+    "stress_interaction": "float32",
+    "resilience_score": "float32",
+    "intervention_priority": "category",
+    "fragile_system": "int8",
+    "predicted_low_yield": "int8",
+    "actual_low_yield": "int8",
+    "confidence_score": "float32"
+}
+
+
+# ==========================================================
+# 2️⃣ Table Schemas
+# ==========================================================
+
+class TableSchema:
+
+    def __init__(self, dtypes, required):
+        self.dtypes = dtypes
+        self.required = required
+
+
+TABLE_SCHEMAS = {
+    "final_state_crop_dataset": TableSchema(
+        {**KEY_COLUMNS, **YIELD_COLUMNS},
+        required=["state", "crop", "year", "yield"]
+    ),
+    "nasa_power_annual_climate": TableSchema(
+        {"state": "category", "year": "int16", **CLIMATE_COLUMNS},
+        required=["state", "year", *CLIMATE_COLUMNS]
+    ),
+    "final_state_crop_with_climate": TableSchema(
+        {**KEY_COLUMNS, **YIELD_COLUMNS, **LEGACY_CLIMATE_COLUMNS, **CLIMATE_COLUMNS},
+        required=["state", "crop", "year", "yield", *CLIMATE_COLUMNS]
+    ),
+    "final_enriched_dataset": TableSchema(
+        {**KEY_COLUMNS, **YIELD_COLUMNS, **LEGACY_CLIMATE_COLUMNS,
+         **CLIMATE_COLUMNS, **FEATURE_COLUMNS},
+        required=[
+            "state",
+            "crop",
+            "year",
+            *CLIMATE_COLUMNS,
+            "nutrient_stress_norm",
+            "climate_stress_norm",
+            "disease_risk_norm",
+            "agro_stress_index",
+            "resilience_score",
+            "intervention_priority",
+            "fragile_system"
+        ]
+    ),
+    "crop_disease_rules": TableSchema(
+        {
+            "crop": "category",
+            "temp_min": "float32",
+            "temp_max": "float32",
+            "humidity_min": "float32",
+            "rainfall_min": "float32"
+        },
+        required=["crop", "disease", "temp_min", "temp_max", "humidity_min", "rainfall_min"]
+    ),
+}
+
+
+# ==========================================================
+# 3️⃣ Apply + Validate
+# ==========================================================
+
+def validate_columns(df, name, columns=None):
+
+    schema = TABLE_SCHEMAS.get(name)
+    if schema is None:
+        return
+
+    # With column projection only the requested columns must exist
+    expected = schema.required if columns is None else columns
+
+    missing = [col for col in expected if col not in df.columns]
+    if missing:
+        raise ValueError(f"{name}: missing required columns: {missing}")
+
+
+def apply_schema(df, name):
+
+    schema = TABLE_SCHEMAS.get(name)
+    if schema is None:
+        return df
+
+    casts = {}
+
+    for col, dtype in schema.dtypes.items():
+        if col not in df.columns or str(df[col].dtype) == dtype:
+            continue
+
+        # Integer flags / counts with gaps cannot be narrowed safely
+        if dtype.startswith("int") and df[col].isna().any():
+            continue
+
+        if dtype.startswith("int"):
+            info = np.iinfo(dtype)
+            if not df[col].between(info.min, info.max).all():
+                continue
+
+        casts[col] = dtype
+
+    return df.astype(casts) if casts else df
+
+
+def csv_dtypes(name):
+
+    # Dtypes read_csv can parse directly (NaN-safe ones only)
+    schema = TABLE_SCHEMAS.get(name)
+    if schema is None:
+        return None
+
+    return {
+        col: dtype for col, dtype in schema.dtypes.items()
+        if dtype in ("category", "float32")
+    }
+
@@ -0,0 +1,205 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.storage.columnar import (
+    CLEANED_DIR,
+    frame_version,
+    load_table,
+    save_table,
+    table_stamp,
+    write_table_marker
+)
+
+
+SHARED_DIR = "data/cache/shared"
+
+# Column buffers start on cache-line boundaries
+ALIGNMENT = 64
+
+# How long a worker waits for a writer to finish the layout of a new table
+ATTACH_WAIT = 10.0
+ATTACH_POLL = 0.5
+
+
+# ==========================================================
+# 1️⃣ Layout Paths
+# ==========================================================
+# A shared layout is only valid for the exact source file it
+# was materialized from (see table_stamp).
+
+def _layout_path(name, shared_dir):
+    return os.path.join(shared_dir, f"{name}.json")
+
+
+# ==========================================================
+# 2️⃣ Materialize (parent or writer process)
+# ==========================================================
+
+def materialize_table(name, directory=CLEANED_DIR, shared_dir=SHARED_DIR):
+
+    stamp = table_stamp(name, directory)
+    df = load_table(name, directory=directory)
+
+    columns = []
+    buffers = []
+    offset = 0
+
+    for col in df.columns:
+
+        series = df[col]
+        if not isinstance(series.dtype, pd.CategoricalDtype) and not (
+            pd.api.types.is_numeric_dtype(series.dtype) or
+            pd.api.types.is_bool_dtype(series.dtype)
+        ):
+            series = series.astype("category")
+
+        entry = {"name": col}
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.cat.codes.to_numpy()
+            entry["categories"] = series.cat.categories.tolist()
+            entry["ordered"] = bool(series.cat.ordered)
+        else:
+            values = series.to_numpy()
+
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        entry.update({"dtype": values.dtype.str, "offset": offset})
+
+        columns.append(entry)
+        buffers.append((offset, np.ascontiguousarray(values)))
+        offset += values.nbytes
+
+    token = hashlib.sha256(
+        json.dumps(stamp, sort_keys=True).encode()
+    ).hexdigest()[:16]
+
+    os.makedirs(shared_dir, exist_ok=True)
+    data_file = f"{name}.{token}.bin"
+    data_path = os.path.join(shared_dir, data_file)
+
+    data = np.zeros(max(offset, 1), dtype=np.uint8)
+    for start, values in buffers:
+        data[start:start + values.nbytes] = values.view(np.uint8)
+
+    # Data first, layout last: a reader never sees a layout without its buffer
+    data.tofile(data_path + f".{os.getpid()}.tmp")
+    os.replace(data_path + f".{os.getpid()}.tmp", data_path)
+
+    layout = {
+        "table": name,
+        "source": stamp,
+        "rows": len(df),
+        "data_file": data_file,
+        "columns": columns
+    }
+
+    layout_path = _layout_path(name, shared_dir)
+    with open(layout_path + f".{os.getpid()}.tmp", "w") as f:
+        json.dump(layout, f)
+    os.replace(layout_path + f".{os.getpid()}.tmp", layout_path)
+
+    # Older buffers stay valid for processes that already mapped them
+    for stale in glob.glob(os.path.join(shared_dir, f"{name}.*.bin")):
+        if os.path.basename(stale) != data_file:
+            os.remove(stale)
+
+    return layout_path
+
+
+# ==========================================================
+# 3️⃣ Attach (worker processes)
+# ==========================================================
+
+def attach_table(name, directory=CLEANED_DIR, shared_dir=SHARED_DIR):
+
+    layout_path = _layout_path(name, shared_dir)
+    if not os.path.exists(layout_path):
+        return None
+
+    with open(layout_path) as f:
+        layout = json.load(f)
+
+    if layout["source"] != table_stamp(name, directory):
+        return None
+
+    data_path = os.path.join(shared_dir, layout["data_file"])
+    if not os.path.exists(data_path):
+        return None
+
+    buffer = np.memmap(data_path, dtype=np.uint8, mode="r")
+    rows = layout["rows"]
+
+    data = {}
+
+    for entry in layout["columns"]:
+
+        dtype = np.dtype(entry["dtype"])
+        start = entry["offset"]
+
+        # Zero-copy, read-only view into the shared page cache
+        values = np.frombuffer(buffer, dtype=dtype, count=rows, offset=start)
+
+        if "categories" in entry:
+            # Codes stay in the mapped buffer; they were written from a valid
+            # Categorical, so the per-worker validation scan is skipped
+            values = pd.Categorical.from_codes(
+                values,
+                dtype=pd.CategoricalDtype(entry["categories"], ordered=entry["ordered"]),
+                validate=False
+            )
+
+        data[entry["name"]] = values
+
+    return pd.DataFrame(data, copy=False)
+
+
+def load_shared_table(name, directory=CLEANED_DIR, shared_dir=SHARED_DIR, wait=ATTACH_WAIT):
+
+    # Worker side: attach only. Writers build the layout (src.runner.serve
+    # before the fork, save_shared_table on every save); a layout that is
+    # still missing after the wait means a private read, not every worker
+    # racing to rebuild it.
+    deadline = time.monotonic() + wait
+    df = attach_table(name, directory, shared_dir)
+
+    while df is None and time.monotonic() < deadline:
+        time.sleep(ATTACH_POLL)
+        df = attach_table(name, directory, shared_dir)
+
+    if df is None:
+        print(f"⚠️ No current shared layout for {name}; loading a private copy")
+        df = load_table(name, directory=directory)
+
+    return df
+
+
+# ==========================================================
+# 4️⃣ Save (writer processes)
+# ==========================================================
+
+def save_shared_table(df, name, directory=CLEANED_DIR, shared_dir=SHARED_DIR):
+
+    # The layout of the new files exists before the version marker moves,
+    # so serving workers re-attach on reload instead of taking private copies
+    path = save_table(df, name, directory, mark=False)
+    materialize_table(name, directory, shared_dir)
+    write_table_marker(name, frame_version(df, name), directory)
+
+    return path
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("tables", nargs="*", default=["final_enriched_dataset"])
+    args = parser.parse_args()
+
+    for table in args.tables:
+        print("Materialized:", materialize_table(table))
@@ -0,0 +1,75 @@
+import json
+from functools import cached_property
+
+from src.analysis.analysis import (
+    crop_resilience_ranking,
+    most_fragile_systems,
+    state_level_summary,
+    stress_heatmap_matrix,
+    top_high_risk_systems
+)
+
+
+DEFAULT_TOP_N = 10
+MAX_TOP_N = 1000
+
+
+def _records(frame):
+    # to_json handles NaN (-> null) and numpy / categorical values
+    return json.loads(frame.to_json(orient="records"))
+
+
+# ---------------------------------------------------
+# Analysis views, memoized per dataset snapshot
+# ---------------------------------------------------
+# Each view is computed on first use and kept for the life of the
+# snapshot. Ranked views keep the fully sorted frame, so any top_n
+# is a head() of it rather than a new sort.
+
+class AnalysisViews:
+
+    def __init__(self, df):
+        self.df = df
+
+    @cached_property
+    def _state_summary(self):
+        return _records(state_level_summary(self.df))
+
+    @cached_property
+    def _crop_ranking(self):
+        return _records(crop_resilience_ranking(self.df))
+
+    @cached_property
+    def _high_risk_order(self):
+        return top_high_risk_systems(self.df, top_n=len(self.df))
+
+    @cached_property
+    def _fragile_order(self):
+        return most_fragile_systems(self.df, top_n=len(self.df))
+
+    @cached_property
+    def _heatmap(self):
+        pivot = stress_heatmap_matrix(self.df)
+        return {
+            "states": [str(state) for state in pivot.index],
+            "crops": [str(crop) for crop in pivot.columns],
+            "values": json.loads(pivot.to_json(orient="values"))
+        }
+
+    # ------------------------------------------------------
+    # Views (JSON-ready)
+    # ------------------------------------------------------
+    def state_summary(self):
+        return {"rows": self._state_summary}
+
+    def crop_ranking(self):
+        return {"rows": self._crop_ranking}
+
+    def high_risk(self, top_n=DEFAULT_TOP_N):
+        return {"top_n": top_n, "rows": _records(self._high_risk_order.head(top_n))}
+
+    def fragile(self, top_n=DEFAULT_TOP_N):
+        return {"top_n": top_n, "rows": _records(self._fragile_order.head(top_n))}
+
+    def heatmap(self):
+        return dict(self._heatmap)
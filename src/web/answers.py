@@ -0,0 +1,135 @@
+from src.web.response_cache import ResponseCache
+
+
+MODES = ("farmer", "research")
+
+# System key of the "highest stress" answer given to unmatched questions
+FALLBACK = None
+
+
+def normalize_mode(mode):
+    # Anything other than farmer mode gets the research view
+    return "farmer" if mode == "farmer" else "research"
+
+
+# ---------------------------------------------------
+# Deterministic formatting (no LLM yet)
+# ---------------------------------------------------
+def format_answer(structured, mode):
+
+    if normalize_mode(mode) == "farmer":
+        return (
+            f"{structured.get('crop', 'Crop')} in "
+            f"{structured.get('state', 'Selected State')} "
+            f"is experiencing stress level {round(structured.get('agro_stress', 0), 2)}.\n\n"
+            f"Recommended focus: Monitor irrigation and nutrient balance.\n"
+            f"Confidence level: {round(structured.get('confidence', 0), 2)}"
+        )
+
+    return (
+        f"State: {structured.get('state')}\n"
+        f"Crop: {structured.get('crop')}\n"
+        f"Agro Stress Index: {round(structured.get('agro_stress', 0), 3)}\n"
+        f"Climate Stress: {round(structured.get('climate', 0), 3)}\n"
+        f"Disease Risk: {round(structured.get('disease', 0), 3)}\n"
+        f"Nutrient Stress: {round(structured.get('nutrient', 0), 3)}\n"
+        f"Confidence Score: {round(structured.get('confidence', 0), 3)}"
+    )
+
+
+# ---------------------------------------------------
+# Graph event answers ("which systems had rice blast in 2010")
+# ---------------------------------------------------
+EVENT_LIST_LIMIT = 10
+
+
+def format_event_answer(graph, query, mode):
+
+    event = graph.node(query.event)["label"]
+    systems = graph.event_systems(query)
+
+    scope = " in " + str(query.year) if query.year is not None else ""
+    if query.state is not None:
+        scope += f" in {query.state}"
+    if query.crop is not None:
+        scope += f" for {query.crop}"
+
+    if not systems:
+        return f"No systems recorded {event}{scope}."
+
+    if normalize_mode(mode) == "farmer":
+        labels = [graph.node(system)["label"] for system in systems[:EVENT_LIST_LIMIT]]
+        more = len(systems) - len(labels)
+        return (
+            f"{event} was recorded{scope} in {len(systems)} system(s): "
+            + ", ".join(labels)
+            + (f" and {more} more." if more else ".")
+        )
+
+    lines = [f"Event: {event}", f"Scope: {scope.strip() or 'all years'}", f"Systems: {len(systems)}"]
+
+    for system in systems[:EVENT_LIST_LIMIT]:
+        observations = graph.event_observations(query, system)
+        years = ", ".join(str(obs["year"]) for obs in observations)
+        stress = max(obs.get("agro_stress", 0) for obs in observations)
+        lines.append(f"{graph.node(system)['label']}: years {years}; peak agro stress {round(stress, 3)}")
+
+    if len(systems) > EVENT_LIST_LIMIT:
+        lines.append(f"... {len(systems) - EVENT_LIST_LIMIT} more")
+
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------
+# Precomputed answers (built with each dataset snapshot)
+# ---------------------------------------------------
+class AnswerBook:
+
+    def __init__(self, index):
+
+        self._answers = {
+            key: {mode: format_answer(summary, mode) for mode in MODES}
+            for key, summary in index.systems.items()
+        }
+        self._answers[FALLBACK] = {
+            mode: format_answer(index.highest_stress, mode) for mode in MODES
+        }
+
+    def get(self, key, mode):
+        return self._answers[key][normalize_mode(mode)]
+
+    def __len__(self):
+        return len(self._answers)
+
+
+# ---------------------------------------------------
+# Answer Page (static shell + cached answer fragment)
+# ---------------------------------------------------
+# home.html only varies in its answer block, so the page is
+# rendered once and split around that block.
+
+class AnswerPage:
+
+    def __init__(self, env, page="home.html", fragment="_answer.html"):
+        self.page_template = env.get_template(page)
+        self.fragment_template = env.get_template(fragment)
+        self.fragments = ResponseCache()
+
+        self.empty_page = self.page_template.render(answer=None)
+
+        empty = self.fragment_template.render(answer=None)
+        prefix, found, suffix = self.empty_page.partition(empty)
+
+        if not found:
+            raise ValueError(f"{page} does not include {fragment}.")
+
+        self._prefix = prefix
+        self._suffix = suffix
+
+    def render(self, key, answer):
+
+        fragment = self.fragments.get_or_create(
+            key, lambda: self.fragment_template.render(answer=answer)
+        )
+
+        return self._prefix + fragment + self._suffix
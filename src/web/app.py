@@ -1,148 +1,361 @@
-from fastapi import FastAPI, Request, Form
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+
+from typing import Literal
+
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Request, Form
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-import pandas as pd
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import PlainTextResponse, Response
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Mount
+
+from src.graph.graph_store import EventQuery, asks_for_systems, find_year, node_id
+from src.storage.columnar import load_table
+from src.storage.shared_frame import load_shared_table
+from src.web.answers import FALLBACK, AnswerPage, normalize_mode
+from src.web.system_index import normalize_name
+from src.web.snapshot import RELOAD_INTERVAL, SnapshotStore
+from src.web.response_cache import CACHE_MAX_AGE, CachedResponse, ResponseCache, etag_matches
+from src.web.batch_query import QueryRequest, QueryResponse, answer_batch
+from src.web.graph_view import (
+    DEFAULT_LIMIT,
+    MAX_HOPS,
+    MAX_LIMIT,
+    PRIORITIES,
+    normalize_priority,
+    subgraph
+)
+from src.web.analysis_views import DEFAULT_TOP_N, MAX_TOP_N
+from src.web.web_metrics import (
+    NOT_MODIFIED,
+    REQUEST_LATENCY,
+    REQUESTS,
+    STAGE_LATENCY,
+    register_caches,
+    registry
+)
+from src.monitoring.metrics import CONTENT_TYPE
+
+DATA_TABLE = "final_enriched_dataset"
+
+# Dataset loader. With AGRO_SHARED_DATASET=1 every worker maps the layout
+# materialized before the fork (python -m src.runner.serve) read-only.
+if os.environ.get("AGRO_SHARED_DATASET") == "1":
+    load_dataset = load_shared_table
+else:
+    load_dataset = load_table
 
-app = FastAPI()
+templates = Jinja2Templates(directory="src/web/templates")
 
-# Mount static folder
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# home.html rendered once; POST / only fills in the cached answer block
+answer_page = AnswerPage(templates.env)
 
-templates = Jinja2Templates(directory="src/web/templates")
+# Rendered /ask answers keyed on (system, mode, dataset version)
+answer_cache = ResponseCache()
 
-# Load dataset once
-df = pd.read_csv("data/cleaned/final_enriched_dataset.csv")
-def interpret_question(question, df):
+# Serialized subgraphs keyed on (query parameters, dataset version)
+graph_cache = ResponseCache()
 
-    q = question.lower()
+# Serialized analysis views keyed on (view, top_n, dataset version)
+analysis_cache = ResponseCache()
 
-    result = {}
+# Client for /api/v1/graph; static, so rendered once
+graph_page = templates.get_template("graph.html").render()
 
-    detected_state = None
-    for state in df["state"].unique():
-        if state.lower() in q:
-            detected_state = state
-            break
+register_caches({
+    "answer": answer_cache,
+    "fragment": answer_page.fragments,
+    "graph": graph_cache,
+    "analysis": analysis_cache
+})
 
-    detected_crop = None
-    for crop in df["crop"].unique():
-        if crop.lower() in q:
-            detected_crop = crop
-            break
 
-    if detected_state and detected_crop:
+router = APIRouter()
 
-        subset = df[
-            (df["state"] == detected_state) &
-            (df["crop"] == detected_crop)
-        ]
 
-        avg = subset.mean(numeric_only=True)
+async def pin_snapshot(request: Request, call_next):
 
-        result = {
-            "state": detected_state,
-            "crop": detected_crop,
-            "agro_stress": float(avg["agro_stress_index"]),
-            "climate": float(avg["climate_stress_norm"]),
-            "disease": float(avg["disease_risk_norm"]),
-            "nutrient": float(avg["nutrient_stress_norm"]),
-            "confidence": float(avg.get("confidence_score", 0))
-        }
+    # One snapshot per request, reported back to the client
+    snapshot = request.app.state.store.current
+    request.state.snapshot = snapshot
 
-    else:
-        # fallback highest stress
-        top = (
-            df.groupby(["state","crop"])["agro_stress_index"]
-            .mean()
-            .sort_values(ascending=False)
-            .head(1)
-        )
+    response = await call_next(request)
+    response.headers["X-Dataset-Version"] = snapshot.version
+
+    return response
+
+
+def endpoint_label(request):
 
-        state, crop = top.index[0]
+    # Route templates, not raw paths, keep label cardinality bounded
+    route = request.scope.get("route")
+    if route is not None:
+        return route.path
 
-        result = {
-            "state": state,
-            "crop": crop,
-            "agro_stress": float(top.iloc[0]),
-            "climate": 0,
-            "disease": 0,
-            "nutrient": 0,
-            "confidence": 0
+    # Mounted apps (static files) set no route; label them by mount name
+    endpoint = request.scope.get("endpoint")
+    for mount in request.app.routes:
+        if isinstance(mount, Mount) and mount.app is endpoint:
+            return mount.name
+
+    return "unmatched"
+
+
+async def record_metrics(request: Request, call_next):
+
+    start = time.perf_counter()
+    status = 500
+
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        labels = {
+            "method": request.method,
+            "endpoint": endpoint_label(request),
+            "mode": getattr(request.state, "mode", ""),
+            "status": status
         }
+        REQUEST_LATENCY.observe(time.perf_counter() - start, **labels)
+        REQUESTS.inc(**labels)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+
+def resolve_question(question, index, matcher):
 
-    return result
+    found = matcher.match_entities(question)
 
+    key = None
+    if found["state"] and found["crop"]:
+        key = (normalize_name(found["state"]), normalize_name(found["crop"]))
+        if key not in index.systems:
+            key = None
 
+    # "Which systems had rice blast / heat stress (in 1983)?" goes to the graph;
+    # "drought risk for rice in punjab" is still a question about one system
+    if (found["disease"] or found["event"]) and (key is None or asks_for_systems(question)):
+        event = node_id("disease", found["disease"]) if found["disease"] else node_id("event", found["event"])
+        return EventQuery(event, find_year(question), found["state"], found["crop"])
 
-@app.get("/", response_class=HTMLResponse)
-def home(request: Request):
-    return templates.TemplateResponse("home.html", {
-        "request": request,
-        "answer": None
-    })
+    return FALLBACK if key is None else key
 
 
-@app.post("/", response_class=HTMLResponse)
+@router.get("/", response_class=HTMLResponse)
+def home():
+    return answer_page.empty_page
+
+
+@router.post("/", response_class=HTMLResponse)
 def ask(request: Request,
         question: str = Form(...),
         mode: str = Form(...)):
 
-    structured = interpret_question(question, df)
+    snapshot = request.state.snapshot
+    mode = request.state.mode = normalize_mode(mode)
 
-    # deterministic formatting (no LLM yet)
+    with STAGE_LATENCY.time(stage="resolve"):
+        key = resolve_question(question, snapshot.index, snapshot.matcher)
 
-    if mode == "farmer":
-        answer = (
-            f"{structured.get('crop', 'Crop')} in "
-            f"{structured.get('state', 'Selected State')} "
-            f"is experiencing stress level "
-            f"{round(structured.get('agro_stress', 0), 2)}.\n\n"
-            f"Recommended focus: Monitor irrigation and nutrient balance.\n"
-            f"Confidence level: {round(structured.get('confidence', 0), 2)}"
+    # Only the answer fragment is rendered (and cached); the page shell is static
+    with STAGE_LATENCY.time(stage="render"):
+        return answer_page.render(
+            (key, mode, snapshot.version),
+            snapshot.answer(key, mode)
         )
 
-    else:  # research mode
-        answer = (
-            f"State: {structured.get('state')}\n"
-            f"Crop: {structured.get('crop')}\n"
-            f"Agro Stress Index: {round(structured.get('agro_stress', 0), 3)}\n"
-            f"Climate Stress: {round(structured.get('climate', 0), 3)}\n"
-            f"Disease Risk: {round(structured.get('disease', 0), 3)}\n"
-            f"Nutrient Stress: {round(structured.get('nutrient', 0), 3)}\n"
-            f"Confidence Score: {round(structured.get('confidence', 0), 3)}"
+
+def cached_answer(request, question, mode):
+
+    snapshot = request.state.snapshot
+    mode = request.state.mode = normalize_mode(mode)
+
+    # Many phrasings collapse onto the same system or event, so key on what was resolved
+    with STAGE_LATENCY.time(stage="resolve"):
+        key = resolve_question(question, snapshot.index, snapshot.matcher)
+
+    with STAGE_LATENCY.time(stage="answer"):
+        cached = answer_cache.get_or_create(
+            (key, mode, snapshot.version),
+            lambda: CachedResponse(snapshot.answer(key, mode), snapshot.version)
+        )
+
+    # Only GET is cacheable downstream; a POST answer is never revalidated
+    if request.method != "GET":
+        return PlainTextResponse(cached.body, headers={"Cache-Control": "no-store"})
+
+    return conditional_response(request, cached, "text/plain")
+
+
+def conditional_response(request, cached, media_type):
+
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"public, max-age={CACHE_MAX_AGE}"
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        NOT_MODIFIED.inc()
+        return Response(status_code=304, headers=headers)
+
+    return Response(cached.body, media_type=media_type, headers=headers)
+
+
+@router.get("/ask", response_class=PlainTextResponse)
+def ask_get(request: Request, question: str, mode: str = "farmer"):
+    return cached_answer(request, question, mode)
+
+
+@router.post("/ask", response_class=PlainTextResponse)
+def ask_api(request: Request, question: str = Form(...), mode: str = Form("farmer")):
+    return cached_answer(request, question, mode)
+
+
+# ---------------------------------------------------
+# JSON Query API (batched)
+# ---------------------------------------------------
+@router.post("/api/v1/query", response_model=QueryResponse)
+async def query_api(request: Request, payload: QueryRequest):
+
+    snapshot = request.state.snapshot
+
+    # Run the batch off the event loop; answer_batch is CPU-bound pandas work
+    with STAGE_LATENCY.time(stage="batch"):
+        results = await run_in_threadpool(
+            answer_batch, payload.queries, snapshot.df, snapshot.index, snapshot.matcher
         )
 
-    return templates.TemplateResponse("home.html", {
-        "request": request,
-        "answer": answer
-    })
+    return {"dataset_version": snapshot.version, "results": results}
+
+
+# ---------------------------------------------------
+# Graph API (subgraphs as JSON, level of detail)
+# ---------------------------------------------------
+@router.get("/graph", response_class=HTMLResponse)
+def graph_view():
+    return graph_page
+
+
+@router.get("/api/v1/graph")
+def graph_api(request: Request,
+              level: Literal["state", "system", "observation"] = "system",
+              state: str | None = None,
+              crop: str | None = None,
+              priority: str | None = None,
+              year: int | None = None,
+              center: str | None = None,
+              hops: int = Query(1, ge=1, le=MAX_HOPS),
+              offset: int = Query(0, ge=0),
+              limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT)):
 
+    snapshot = request.state.snapshot
 
-@app.post("/ask", response_class=PlainTextResponse)
-def ask_api(question: str = Form(...), mode: str = Form("farmer")):
-    structured = interpret_question(question, df)
+    if center is not None and snapshot.graph.node(center) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown node: {center}")
 
-    if mode == "farmer":
-        return (
-            f"{structured.get('crop', 'Crop')} in "
-            f"{structured.get('state', 'Selected State')} "
-            f"is experiencing stress level {round(structured.get('agro_stress', 0), 2)}.\n\n"
-            f"Recommended focus: Monitor irrigation and nutrient balance.\n"
-            f"Confidence level: {round(structured.get('confidence', 0), 2)}"
+    if priority is not None and normalize_priority(priority) is None:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown priority: {priority} (expected one of {', '.join(PRIORITIES)})"
         )
 
-    return (
-        f"State: {structured.get('state')}\n"
-        f"Crop: {structured.get('crop')}\n"
-        f"Agro Stress Index: {round(structured.get('agro_stress', 0), 3)}\n"
-        f"Climate Stress: {round(structured.get('climate', 0), 3)}\n"
-        f"Disease Risk: {round(structured.get('disease', 0), 3)}\n"
-        f"Nutrient Stress: {round(structured.get('nutrient', 0), 3)}\n"
-        f"Confidence Score: {round(structured.get('confidence', 0), 3)}"
-    )
+    params = (level, state, crop, priority, year, center, hops, offset, limit)
+
+    def build():
+        view = subgraph(snapshot.graph, *params)
+        view["dataset_version"] = snapshot.version
+        return CachedResponse(json.dumps(view), snapshot.version)
+
+    with STAGE_LATENCY.time(stage="graph"):
+        cached = graph_cache.get_or_create((params, snapshot.version), build)
+
+    return conditional_response(request, cached, "application/json")
+
+
+# ---------------------------------------------------
+# Analysis API (memoized per dataset version)
+# ---------------------------------------------------
+def analysis_response(request, view, *args):
+
+    snapshot = request.state.snapshot
+
+    def build():
+        payload = getattr(snapshot.analysis, view)(*args)
+        payload["dataset_version"] = snapshot.version
+        return CachedResponse(json.dumps(payload), snapshot.version)
+
+    with STAGE_LATENCY.time(stage="analysis"):
+        cached = analysis_cache.get_or_create((view, args, snapshot.version), build)
+
+    return conditional_response(request, cached, "application/json")
+
+
+@router.get("/api/v1/analysis/states")
+def analysis_states(request: Request):
+    return analysis_response(request, "state_summary")
+
+
+@router.get("/api/v1/analysis/crops")
+def analysis_crops(request: Request):
+    return analysis_response(request, "crop_ranking")
+
+
+@router.get("/api/v1/analysis/high-risk")
+def analysis_high_risk(request: Request, top_n: int = Query(DEFAULT_TOP_N, ge=1, le=MAX_TOP_N)):
+    return analysis_response(request, "high_risk", top_n)
+
+
+@router.get("/api/v1/analysis/fragile")
+def analysis_fragile(request: Request, top_n: int = Query(DEFAULT_TOP_N, ge=1, le=MAX_TOP_N)):
+    return analysis_response(request, "fragile", top_n)
+
+
+@router.get("/api/v1/analysis/heatmap")
+def analysis_heatmap(request: Request):
+    return analysis_response(request, "heatmap")
+
+
+# ---------------------------------------------------
+# App
+# ---------------------------------------------------
+@asynccontextmanager
+async def lifespan(app):
+    app.state.store.start()
+    yield
+    app.state.store.stop()
+
+
+def create_app(store):
+
+    # store: anything with .current / .start() / .stop() (see snapshot.py)
+    app = FastAPI(lifespan=lifespan)
+    app.state.store = store
+
+    # Mount static folder
+    app.mount("/static", StaticFiles(directory="static"), name="static")
+    app.include_router(router)
+
+    # Added last runs first: metrics wrap the snapshot pinning
+    app.middleware("http")(pin_snapshot)
+    app.middleware("http")(record_metrics)
 
+    return app
 
 
+# Active snapshot (frame + per-system index + entity matcher). A background
+# watcher swaps in a new one when the pipeline rewrites the table.
+store = SnapshotStore(
+    DATA_TABLE,
+    load_dataset,
+    interval=float(os.environ.get("AGRO_RELOAD_INTERVAL", RELOAD_INTERVAL))
+)
 
+app = create_app(store)
@@ -0,0 +1,149 @@
+import pandas as pd
+from pydantic import BaseModel, Field, model_validator
+
+from src.web.system_index import SYSTEM_METRICS
+
+
+MAX_BATCH_SIZE = 500
+
+
+# ---------------------------------------------------
+# Request / Response Models
+# ---------------------------------------------------
+class QueryItem(BaseModel):
+    question: str | None = None
+    state: str | None = None
+    crop: str | None = None
+    year_start: int | None = None
+    year_end: int | None = None
+
+    @model_validator(mode="after")
+    def check_query(self):
+
+        # Raised as ValueError so FastAPI answers 422, not a fake non-match
+        if self.question is None and not (self.state and self.crop):
+            raise ValueError("each query needs a question or both state and crop")
+
+        if self.year_start is not None and self.year_end is not None and self.year_start > self.year_end:
+            raise ValueError("year_start must not be after year_end")
+
+        return self
+
+
+class QueryRequest(BaseModel):
+    queries: list[QueryItem] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class QueryResult(BaseModel):
+    state: str | None
+    crop: str | None
+    year_start: int | None = None
+    year_end: int | None = None
+    matched: bool
+    years: int | None = None
+    agro_stress: float | None = None
+    climate: float | None = None
+    disease: float | None = None
+    nutrient: float | None = None
+    confidence: float | None = None
+
+
+class QueryResponse(BaseModel):
+    dataset_version: str
+    results: list[QueryResult]
+
+
+# ---------------------------------------------------
+# Batch Evaluation
+# ---------------------------------------------------
+def _resolve(item, index, matcher):
+
+    if item.question is not None and not (item.state and item.crop):
+        state, crop = matcher.match(item.question)
+    else:
+        state, crop = item.state, item.crop
+
+    summary = index.lookup(state, crop) if state and crop else None
+
+    return state, crop, summary
+
+
+def answer_batch(queries, df, index, matcher):
+
+    results = [None] * len(queries)
+    ranged = []
+
+    for i, item in enumerate(queries):
+
+        state, crop, summary = _resolve(item, index, matcher)
+
+        if summary is None:
+            # Free-text questions keep the /ask fallback; explicit pairs report no match
+            if item.question is not None and not (item.state and item.crop):
+                results[i] = dict(index.highest_stress, matched=False)
+            else:
+                results[i] = {"state": state, "crop": crop, "matched": False}
+
+        elif item.year_start is None and item.year_end is None:
+            results[i] = dict(summary, matched=True)
+
+        else:
+            ranged.append((
+                i,
+                summary["state"],
+                summary["crop"],
+                item.year_start,
+                item.year_end
+            ))
+
+    if ranged:
+        for i, row in _answer_year_ranges(ranged, df).items():
+            results[i] = row
+
+    return results
+
+
+def _answer_year_ranges(ranged, df):
+
+    # One join + groupby over every (state, crop, year-range) query
+    queries = pd.DataFrame(
+        ranged,
+        columns=["query_id", "state", "crop", "year_start", "year_end"]
+    ).astype({"year_start": float, "year_end": float})
+
+    metric_cols = [col for col in SYSTEM_METRICS.values() if col in df.columns]
+
+    rows = df[["state", "crop", "year"] + metric_cols]
+    joined = queries.merge(rows, on=["state", "crop"], how="left")
+
+    # Open-ended ranges are stored as NaN bounds
+    in_range = (
+        (joined["year_start"].isna() | (joined["year"] >= joined["year_start"])) &
+        (joined["year_end"].isna() | (joined["year"] <= joined["year_end"]))
+    )
+    joined = joined[in_range]
+
+    means = joined.groupby("query_id")[metric_cols].mean()
+    counts = joined.groupby("query_id")["year"].count()
+
+    answers = {}
+
+    for query_id, state, crop, year_start, year_end in ranged:
+
+        row = {
+            "state": state,
+            "crop": crop,
+            "year_start": year_start,
+            "year_end": year_end,
+            "matched": query_id in means.index,
+            "years": int(counts.get(query_id, 0))
+        }
+
+        if row["matched"]:
+            avg = means.loc[query_id]
+            for key, col in SYSTEM_METRICS.items():
+                row[key] = float(avg.get(col, 0))
+
+        answers[query_id] = row
+
+    return answers
@@ -0,0 +1,87 @@
+import re
+
+from src.processing.aliases import STATE_ALIASES, CROP_ALIASES
+from src.web.system_index import normalize_name
+
+
+# Surface forms for the climate-event nodes of the graph store
+EVENT_ALIASES = {
+    "heat": "heat_stress",
+    "heat stress": "heat_stress",
+    "heatwave": "heat_stress",
+    "drought": "drought_stress",
+    "drought stress": "drought_stress"
+}
+
+ENTITY_KINDS = ("state", "crop", "disease", "event")
+
+
+# ---------------------------------------------------
+# Compiled state / crop / disease / event matcher
+# ---------------------------------------------------
+class EntityMatcher:
+
+    def __init__(self, states, crops, state_aliases=None, crop_aliases=None,
+                 diseases=(), events=()):
+
+        # surface form → (kind, canonical name)
+        self._entities = {}
+
+        self._register("state", states, state_aliases or {})
+        self._register("crop", crops, crop_aliases or {})
+        self._register("disease", diseases, {})
+        self._register("event", events, EVENT_ALIASES if events else {})
+
+        # Longest names first so the alternation prefers "west bengal" over "bengal"
+        surfaces = sorted(self._entities, key=len, reverse=True)
+        alternation = "|".join(
+            r"\s+".join(re.escape(word) for word in surface.split())
+            for surface in surfaces
+        )
+
+        self._pattern = re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+
+    def _register(self, kind, names, aliases):
+
+        canonical = {normalize_name(name): name for name in names}
+
+        for name in canonical.values():
+            self._entities[normalize_name(name)] = (kind, name)
+
+        for alias, target in aliases.items():
+            target = canonical.get(normalize_name(target))
+            if target is not None:
+                self._entities.setdefault(normalize_name(alias), (kind, target))
+
+    def match_entities(self, question):
+
+        found = dict.fromkeys(ENTITY_KINDS)
+        found_len = dict.fromkeys(ENTITY_KINDS, 0)
+
+        for m in self._pattern.finditer(question):
+
+            kind, name = self._entities[normalize_name(m.group(0))]
+            length = m.end() - m.start()
+
+            if length > found_len[kind]:
+                found[kind] = name
+                found_len[kind] = length
+
+        return found
+
+    def match(self, question):
+
+        found = self.match_entities(question)
+
+        return found["state"], found["crop"]
+
+    @classmethod
+    def from_index(cls, index, diseases=(), events=()):
+        return cls(
+            index.states,
+            index.crops,
+            state_aliases=STATE_ALIASES,
+            crop_aliases=CROP_ALIASES,
+            diseases=diseases,
+            events=events
+        )
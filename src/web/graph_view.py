@@ -0,0 +1,203 @@
+from collections import Counter, defaultdict
+
+from src.graph.graph_store import node_id
+from src.web.system_index import normalize_name
+
+
+# ---------------------------------------------------
+# Levels of detail (zoomed out → zoomed in)
+# ---------------------------------------------------
+# state:        one cluster node per state, linked to crops
+# system:       state, crop and (state, crop) system nodes
+# observation:  system-year observations of the selected systems
+#
+# limit pages the items of the level (clusters, systems or observations).
+# The crop, state or system nodes they attach to come on top, at most two
+# per item. In a k-hop neighbourhood, limit caps all returned nodes.
+
+PRIORITIES = ("High Priority", "Moderate Priority", "Low Priority")
+
+DEFAULT_LIMIT = 200
+MAX_LIMIT = 2000
+MAX_HOPS = 3
+
+
+def _node_json(graph, key, **extra):
+
+    # NaN is not valid JSON
+    attrs = {k: None if isinstance(v, float) and v != v else v for k, v in graph.node(key).items()}
+
+    return {"id": key, **attrs, **extra}
+
+
+def _edges_between(graph, keys):
+
+    # Each undirected edge once, only between nodes in the payload
+    edges = []
+
+    for key in keys:
+        for relation, targets in graph.relations(key).items():
+            for target in targets:
+                if target in keys and key < target:
+                    edges.append({"source": key, "target": target, "relation": relation})
+
+    return edges
+
+
+def _page(keys, offset, limit):
+
+    end = offset + limit
+
+    return keys[offset:end], {
+        "total": len(keys),
+        "offset": offset,
+        "limit": limit,
+        "next_offset": end if end < len(keys) else None
+    }
+
+
+def normalize_priority(priority):
+
+    # "high", "HIGH", "high priority" -> "High Priority"; None if unknown
+    name = normalize_name(priority).removesuffix(" priority")
+
+    for value in PRIORITIES:
+        if normalize_name(value).removesuffix(" priority") == name:
+            return value
+
+    return None
+
+
+def filter_systems(graph, state=None, crop=None, priority=None):
+
+    filters = {
+        "state": normalize_name(state) if state else None,
+        "crop": normalize_name(crop) if crop else None,
+        "priority": normalize_priority(priority) if priority else None
+    }
+
+    return sorted(graph.find("system", **{k: v for k, v in filters.items() if v is not None}))
+
+
+# ---------------------------------------------------
+# Views
+# ---------------------------------------------------
+def cluster_view(graph, systems, offset=0, limit=DEFAULT_LIMIT):
+
+    # Systems collapsed into one node per state, aggregated server side
+    by_state = defaultdict(list)
+    for key in systems:
+        by_state[graph.node(key)["state"]].append(graph.node(key))
+
+    states, page = _page(sorted(by_state), offset, limit)
+
+    nodes = []
+    edges = []
+    crops = {}
+
+    for state in states:
+
+        members = by_state[state]
+        cluster = node_id("cluster", state)
+
+        nodes.append({
+            "id": cluster,
+            "type": "cluster",
+            "label": f"{state} ({len(members)})",
+            "state": state,
+            "systems": len(members),
+            "agro_stress": round(sum(m.get("agro_stress", 0) for m in members) / len(members), 3),
+            "priority": dict(Counter(m["priority"] for m in members if "priority" in m))
+        })
+
+        for crop, count in Counter(m["crop"] for m in members).items():
+            crops[node_id("crop", crop)] = True
+            edges.append({"source": cluster, "target": node_id("crop", crop),
+                          "relation": "HAS_SYSTEM", "weight": count})
+
+    nodes.extend(_node_json(graph, key) for key in crops)
+
+    return nodes, edges, page
+
+
+def system_view(graph, systems, offset=0, limit=DEFAULT_LIMIT):
+
+    keys, page = _page(systems, offset, limit)
+
+    included = dict.fromkeys(keys)
+    for key in keys:
+        attrs = graph.node(key)
+        included[node_id("state", attrs["state"])] = None
+        included[node_id("crop", attrs["crop"])] = None
+
+    nodes = [_node_json(graph, key) for key in included]
+
+    return nodes, _edges_between(graph, included), page
+
+
+def observation_view(graph, systems, year=None, offset=0, limit=DEFAULT_LIMIT):
+
+    observations = [
+        obs for system in systems
+        for obs in graph.neighbors(system, "HAS_OBSERVATION")
+        if year is None or graph.node(obs)["year"] == year
+    ]
+
+    keys, page = _page(observations, offset, limit)
+
+    included = dict.fromkeys(keys)
+    for key in keys:
+        included[graph.node(key)["system"]] = None
+
+    nodes = [_node_json(graph, key) for key in included]
+
+    return nodes, _edges_between(graph, included), page
+
+
+def neighbourhood_view(graph, center, hops=1, limit=DEFAULT_LIMIT):
+
+    # Breadth-first k-hop expansion, cut off at the node limit
+    hop = {center: 0}
+    frontier = [center]
+    truncated = False
+
+    for depth in range(1, hops + 1):
+
+        next_frontier = []
+
+        for key in frontier:
+            for target in graph.neighbors(key):
+                if target in hop:
+                    continue
+                if len(hop) >= limit:
+                    truncated = True
+                    break
+                hop[target] = depth
+                next_frontier.append(target)
+
+        frontier = next_frontier
+
+    nodes = [_node_json(graph, key, hop=depth) for key, depth in hop.items()]
+    page = {"total": None if truncated else len(hop), "offset": 0, "limit": limit, "truncated": truncated}
+
+    return nodes, _edges_between(graph, hop), page
+
+
+def subgraph(graph, level="system", state=None, crop=None, priority=None, year=None,
+             center=None, hops=1, offset=0, limit=DEFAULT_LIMIT):
+
+    if center is not None:
+        nodes, edges, page = neighbourhood_view(graph, center, hops, limit)
+    else:
+        systems = filter_systems(graph, state, crop, priority)
+
+        if level == "state":
+            nodes, edges, page = cluster_view(graph, systems, offset, limit)
+        elif level == "observation":
+            nodes, edges, page = observation_view(graph, systems, year, offset, limit)
+        else:
+            nodes, edges, page = system_view(graph, systems, offset, limit)
+
+    page["nodes"] = len(nodes)
+
+    return {"level": level, "center": center, "page": page, "nodes": nodes, "edges": edges}
@@ -0,0 +1,90 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+CACHE_SIZE = 1024
+CACHE_TTL = 300.0
+
+# Clients / proxies may reuse an answer this long, then revalidate via ETag
+CACHE_MAX_AGE = 60
+
+
+# ---------------------------------------------------
+# Cached Response
+# ---------------------------------------------------
+class CachedResponse:
+
+    def __init__(self, body, version):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(
+            f"{version}:{body}".encode()
+        ).hexdigest()[:16] + '"'
+
+
+def etag_matches(if_none_match, etag):
+
+    if not if_none_match:
+        return False
+
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+
+    # Weak comparison, as for GET revalidation
+    return "*" in tags or etag in [tag.removeprefix("W/") for tag in tags]
+
+
+# ---------------------------------------------------
+# Bounded LRU + TTL Cache
+# ---------------------------------------------------
+class ResponseCache:
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+
+        with self._lock:
+
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            if entry is not None:
+                del self._entries[key]
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+
+        with self._lock:
+
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_create(self, key, build):
+
+        value = self.get(key)
+
+        if value is None:
+            # Concurrent misses may both build; the result is identical
+            value = build()
+            self.put(key, value)
+
+        return value
+
+    def __len__(self):
+        return len(self._entries)
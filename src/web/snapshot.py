@@ -0,0 +1,140 @@
+import threading
+
+from src.graph.graph_snapshot import graph_version, load_graph_snapshot, load_rules
+from src.graph.graph_store import EventQuery, build_graph_store
+from src.storage.columnar import table_marker, table_version
+from src.web.analysis_views import AnalysisViews
+from src.web.answers import AnswerBook, format_event_answer
+from src.web.entity_matcher import EntityMatcher
+from src.web.system_index import build_system_index
+
+
+RELOAD_INTERVAL = 5.0
+
+
+def load_graph(version, df, index):
+
+    # Map the prebuilt snapshot when it matches this dataset, else build in process
+    graph = load_graph_snapshot(graph_version(version))
+    if graph is None:
+        graph = build_graph_store(df, load_rules(), index)
+
+    return graph
+
+
+# ---------------------------------------------------
+# Immutable Dataset Snapshot
+# ---------------------------------------------------
+# Everything a request reads, built together so a request
+# never mixes the frame of one version with the index of another.
+
+class DatasetSnapshot:
+
+    def __init__(self, version, df):
+        self.version = version
+        self.df = df
+        self.index = build_system_index(df)
+        self.graph = load_graph(version, df, self.index)
+        self.matcher = EntityMatcher.from_index(
+            self.index,
+            diseases=[self.graph.node(key)["name"] for key in self.graph.nodes("disease")],
+            events=[self.graph.node(key)["name"] for key in self.graph.nodes("climate_event")]
+        )
+        self.answers = AnswerBook(self.index)
+        self.analysis = AnalysisViews(df)
+
+    def answer(self, key, mode):
+
+        # Event questions are answered from the graph, systems from the book
+        if isinstance(key, EventQuery):
+            return format_event_answer(self.graph, key, mode)
+
+        return self.answers.get(key, mode)
+
+
+# ---------------------------------------------------
+# Snapshot Store + Background Watcher
+# ---------------------------------------------------
+class SnapshotStore:
+
+    def __init__(self, name, loader, interval=RELOAD_INTERVAL):
+        self.name = name
+        self.loader = loader
+        self.interval = interval
+
+        self._marker = table_marker(name)
+        self._current = DatasetSnapshot(table_version(name), loader(name))
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def current(self):
+        # A single attribute read: readers get the old or the new snapshot, never half
+        return self._current
+
+    def refresh(self):
+
+        # One marker per save_table call, written after the data files
+        marker = table_marker(self.name)
+        if marker == self._marker:
+            return False
+
+        version = table_version(self.name)
+        if version == self._current.version:
+            self._marker = marker
+            return False
+
+        # Load and index off the request path, then swap
+        self.publish(version, self.loader(self.name))
+        self._marker = marker
+        print(f"🔄 Reloaded {self.name} (version {version})")
+
+        return True
+
+    def publish(self, version, df):
+
+        snapshot = DatasetSnapshot(version, df)
+        self._current = snapshot
+
+        return snapshot
+
+    def _watch(self):
+
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the last good snapshot (e.g. file mid-write)
+                print(f"❌ Reload of {self.name} failed: {e}")
+
+    def start(self):
+
+        if self.interval <= 0 or self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name=f"{self.name}-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+
+class StaticSnapshotStore:
+
+    # One fixed snapshot and no watcher (benchmarks on synthetic frames)
+    def __init__(self, version, df):
+        self.current = DatasetSnapshot(version, df)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
@@ -0,0 +1,79 @@
+from types import MappingProxyType
+
+
+# ---------------------------------------------------
+# Columns summarised per (state, crop) system
+# ---------------------------------------------------
+SYSTEM_METRICS = {
+    "agro_stress": "agro_stress_index",
+    "climate": "climate_stress_norm",
+    "disease": "disease_risk_norm",
+    "nutrient": "nutrient_stress_norm",
+    "confidence": "confidence_score",
+}
+
+
+def normalize_name(name):
+    return " ".join(str(name).lower().split())
+
+
+# ---------------------------------------------------
+# Immutable per-system lookup table
+# ---------------------------------------------------
+class SystemIndex:
+
+    def __init__(self, systems, highest_stress):
+        self._systems = MappingProxyType(systems)
+        self._highest_stress = MappingProxyType(highest_stress)
+        self.states = tuple(dict.fromkeys(s["state"] for s in systems.values()))
+        self.crops = tuple(dict.fromkeys(s["crop"] for s in systems.values()))
+
+    @property
+    def systems(self):
+        return self._systems
+
+    @property
+    def highest_stress(self):
+        return self._highest_stress
+
+    def lookup(self, state, crop):
+        return self._systems.get((normalize_name(state), normalize_name(crop)))
+
+    def __len__(self):
+        return len(self._systems)
+
+
+def build_system_index(df):
+
+    columns = [col for col in SYSTEM_METRICS.values() if col in df.columns]
+
+    means = df.groupby(["state", "crop"], observed=True)[columns].mean()
+
+    systems = {}
+
+    for (state, crop), values in zip(means.index, means.to_numpy(dtype=float)):
+
+        avg = dict(zip(columns, values))
+
+        summary = {"state": state, "crop": crop}
+        for key, col in SYSTEM_METRICS.items():
+            summary[key] = float(avg.get(col, 0))
+
+        systems[(normalize_name(state), normalize_name(crop))] = MappingProxyType(summary)
+
+    # ---------------------------------------------------
+    # Fallback answer: highest mean agro stress system
+    # ---------------------------------------------------
+    top_state, top_crop = means["agro_stress_index"].idxmax()
+
+    highest_stress = {
+        "state": top_state,
+        "crop": top_crop,
+        "agro_stress": float(means["agro_stress_index"].max()),
+        "climate": 0,
+        "disease": 0,
+        "nutrient": 0,
+        "confidence": 0
+    }
+
+    return SystemIndex(systems, highest_stress)
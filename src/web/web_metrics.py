@@ -0,0 +1,48 @@
+from src.monitoring.metrics import Registry
+
+
+# ---------------------------------------------------
+# Web App Metrics (per worker process)
+# ---------------------------------------------------
+registry = Registry()
+
+REQUEST_LATENCY = registry.histogram(
+    "agro_http_request_duration_seconds",
+    "HTTP request latency by endpoint and answer mode.",
+    labelnames=("method", "endpoint", "mode", "status")
+)
+
+REQUESTS = registry.counter(
+    "agro_http_requests_total",
+    "HTTP requests by endpoint and answer mode.",
+    labelnames=("method", "endpoint", "mode", "status")
+)
+
+# Where a request spends its time: entity detection, lookup, rendering, batch work
+STAGE_LATENCY = registry.histogram(
+    "agro_request_stage_duration_seconds",
+    "Time spent in each request-handling stage.",
+    labelnames=("stage",)
+)
+
+NOT_MODIFIED = registry.counter(
+    "agro_http_not_modified_total",
+    "Conditional requests answered with 304 Not Modified."
+)
+
+
+def register_caches(caches):
+
+    # caches: name -> ResponseCache, read at scrape time
+    registry.callback(
+        "agro_cache_hits_total", "Response cache hits.", "counter", ("cache",),
+        lambda: {(name,): cache.hits for name, cache in caches.items()}
+    )
+    registry.callback(
+        "agro_cache_misses_total", "Response cache misses.", "counter", ("cache",),
+        lambda: {(name,): cache.misses for name, cache in caches.items()}
+    )
+    registry.callback(
+        "agro_cache_entries", "Entries currently held per response cache.", "gauge", ("cache",),
+        lambda: {(name,): len(cache) for name, cache in caches.items()}
+    )
@@ -1,5 +1,5 @@
 from src.analysis.analysis import state_level_summary
-import pandas as pd
+from src.storage.columnar import load_table
 
-df = pd.read_csv("data/cleaned/final_enriched_dataset.csv")
+df = load_table("final_enriched_dataset")
 print(state_level_summary(df).head(10))
\ No newline at end of file
@@ -0,0 +1,100 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.data_fetch.power_client import PowerClient
+
+
+PAYLOAD = {"properties": {"parameter": {"T2M": {"202001": 25.0}}}}
+
+
+# ---------------------------------------------------
+# Stub POWER server
+# ---------------------------------------------------
+# Each test queues the status codes to answer with; every request
+# is recorded so tests can count how often the client called.
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+
+        self.server.requests.append(self.path)
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+
+        body = json.dumps(PAYLOAD if status == 200 else {"error": status}).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    httpd.statuses = []
+    httpd.requests = []
+
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    yield httpd
+
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client(server, tmp_path):
+    return PowerClient(
+        base_url=f"http://127.0.0.1:{server.server_port}/monthly",
+        cache_dir=str(tmp_path),
+        rate=100.0,
+        burst=10,
+        max_retries=2,
+        backoff=0.0,
+        timeout=5
+    )
+
+
+# ---------------------------------------------------
+# Tests
+# ---------------------------------------------------
+def test_retries_retryable_status(server, client):
+
+    server.statuses = [429, 503]
+
+    assert client.fetch_point(30.9, 75.8, 2000, 2001) == PAYLOAD
+    assert len(server.requests) == 3
+
+
+def test_cache_hit_skips_request(server, client):
+
+    client.fetch_point(30.9, 75.8, 2000, 2001)
+    assert client.fetch_point(30.9, 75.8, 2000, 2001) == PAYLOAD
+
+    assert len(server.requests) == 1
+
+
+def test_client_error_is_not_retried(server, client):
+
+    server.statuses = [404]
+
+    with pytest.raises(requests.HTTPError):
+        client.fetch_point(30.9, 75.8, 2000, 2001)
+
+    assert len(server.requests) == 1
+
+    # Failures are not cached: the next call asks the server again
+    assert client.fetch_point(30.9, 75.8, 2000, 2001) == PAYLOAD
+    assert len(server.requests) == 2